@@ -2,6 +2,8 @@
 ASGI config for app project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Requests are resolved against app.asgi_urls, which serves the public read
+endpoints of the blog API with async views.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
@@ -9,8 +11,21 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
-application = get_asgi_application()
+
+class AsyncReadASGIHandler(ASGIHandler):
+    """ASGI handler resolving requests against the async URLconf."""
+    urlconf = 'app.asgi_urls'
+
+    async def get_response_async(self, request):
+        """Route the request through the async URLconf."""
+        request.urlconf = self.urlconf
+        return await super().get_response_async(request)
+
+
+django.setup(set_prefix=False)
+application = AsyncReadASGIHandler()
@@ -0,0 +1,14 @@
+"""
+URL configuration used by the ASGI application.
+
+The async read views of the blog API come first; everything else is
+routed exactly as in app.urls.
+"""
+from django.urls import include, path
+
+from app import urls
+
+urlpatterns = [
+    path('api/blog/', include('blog.async_urls')),
+    *urls.urlpatterns,
+]
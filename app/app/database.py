@@ -0,0 +1,99 @@
+"""
+Database settings built from the environment.
+
+With DB_HOST set the project talks to PostgreSQL, as in docker-compose;
+otherwise it falls back to the local sqlite file. DB_REPLICAS lists read
+replicas, as comma-separated hosts, or sqlite files without DB_HOST; they
+become the replica1, replica2, ... aliases used by core.routers.
+"""
+
+# Seconds a connection is kept open for reuse across requests.
+DEFAULT_CONN_MAX_AGE = 60
+# Seconds to wait for the server when opening a connection.
+DEFAULT_CONNECT_TIMEOUT = 5
+REPLICA_ALIAS_PREFIX = 'replica'
+
+
+def env_flag(environ, name, default=False):
+    """Return an environment variable read as a boolean."""
+    value = environ.get(name)
+    if value is None:
+        return default
+
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def replica_aliases(databases):
+    """Return the aliases of the read replicas in a DATABASES setting."""
+    return [
+        alias for alias in databases
+        if alias.startswith(REPLICA_ALIAS_PREFIX)
+    ]
+
+
+def with_replicas(environ, primary, replica):
+    """Return the DATABASES setting for a primary and its replicas.
+
+    replica builds the settings of a replica from its DB_REPLICAS entry.
+    """
+    databases = {'default': primary}
+    names = environ.get('DB_REPLICAS', '').split(',')
+    replicas = [name.strip() for name in names if name.strip()]
+    for number, name in enumerate(replicas, 1):
+        databases[f'{REPLICA_ALIAS_PREFIX}{number}'] = replica(name)
+
+    return databases
+
+
+def database_settings(environ, base_dir):
+    """Return the DATABASES setting for the given environment.
+
+    PostgreSQL connections persist for DB_CONN_MAX_AGE seconds and are
+    health checked before reuse. Set DB_POOL=pgbouncer when connecting
+    through PgBouncer in transaction pooling mode, which cannot keep the
+    server-side cursors Django uses for iterator().
+    """
+    if not environ.get('DB_HOST'):
+        # Each sqlite replica gets a test database of its own, so tests
+        # can tell which file a query went to.
+        return with_replicas(environ, {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': environ.get('DB_NAME') or base_dir / 'db.sqlite3',
+        }, lambda name: {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': name,
+        })
+
+    database = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'HOST': environ['DB_HOST'],
+        'PORT': environ.get('DB_PORT', ''),
+        'NAME': environ.get('DB_NAME', ''),
+        'USER': environ.get('DB_USER', ''),
+        'PASSWORD': environ.get('DB_PASS', ''),
+        'CONN_MAX_AGE': int(
+            environ.get('DB_CONN_MAX_AGE', DEFAULT_CONN_MAX_AGE)
+        ),
+        'CONN_HEALTH_CHECKS': env_flag(
+            environ,
+            'DB_CONN_HEALTH_CHECKS',
+            default=True,
+        ),
+        'OPTIONS': {
+            'connect_timeout': int(
+                environ.get('DB_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT)
+            ),
+        },
+    }
+    pool = environ.get('DB_POOL', '').strip().lower()
+    if pool == 'pgbouncer':
+        database['DISABLE_SERVER_SIDE_CURSORS'] = True
+    elif pool:
+        raise ValueError(f'Unsupported DB_POOL {pool!r}.')
+
+    # Postgres replicas are read-only and use the primary's test database.
+    return with_replicas(environ, database, lambda host: {
+        **database,
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    })
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from app.database import database_settings, env_flag, replica_aliases
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -46,15 +49,21 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.timing.TimingMiddleware',
+    'core.routers.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'core.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.CsrfViewMiddleware',
+    'core.middleware.AuthenticationMiddleware',
+    'core.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Token-authenticated APIs, skipped by the session, CSRF, auth and message
+# middleware, see core/middleware.py.
+API_PATH_PREFIXES = ['/api/blog/', '/api/user/']
+
 ROOT_URLCONF = 'app.urls'
 
 TEMPLATES = [
@@ -78,14 +87,66 @@ WSGI_APPLICATION = 'app.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+# PostgreSQL when DB_HOST is set, sqlite otherwise, see app/database.py.
+
+DATABASES = database_settings(os.environ, BASE_DIR)
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+DATABASE_REPLICAS = replica_aliases(DATABASES)
+
+# Seconds a replica may trail the primary. Clients that wrote read from
+# the primary for this long, and responses read from a replica this soon
+# after a change are not cached.
+REPLICA_LAG_SECONDS = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
 
-DATABASES = {
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Seconds a rendered blog response stays cached. Entries are invalidated
+# earlier by bumping the blog data version, see blog/cache.py.
+BLOG_CACHE_TIMEOUT = 300
+
+# Seconds a resolved auth token stays in the shared cache and in each
+# process' own cache, see user/authentication.py. Deactivated users and
+# deleted tokens may keep authenticating in other processes for up to
+# AUTH_TOKEN_LOCAL_CACHE_TIMEOUT seconds.
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = 30
+AUTH_TOKEN_LOCAL_CACHE_SIZE = 10000
+
+
+# Request timing
+# Server-Timing headers, sampled request logs and the slow query log, see
+# core/timing.py. Off unless REQUEST_TIMING is set in the environment.
+
+REQUEST_TIMING_ENABLED = env_flag(os.environ, 'REQUEST_TIMING')
+REQUEST_TIMING_LOG_SAMPLE_RATE = 0.01
+SLOW_QUERY_THRESHOLD_MS = 100
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'core.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -137,3 +198,19 @@ REST_FRAMEWORK = {
 SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True
 }
+
+# Counts of at least this many rows may be planner estimates, which are
+# cached for COUNT_CACHE_TIMEOUT seconds. See core/counting.py.
+ESTIMATED_COUNT_THRESHOLD = 10_000
+COUNT_CACHE_TIMEOUT = 60
+
+# New posts are copied into the feeds of followers by FEED_FAN_OUT_WORKERS
+# threads once committed, inline when FEED_FAN_OUT_ASYNC is off. Posts of
+# authors with at least FEED_HOT_AUTHOR_FOLLOWERS followers are read when
+# the feed is, and backfilled when they drop below it. See blog/feed.py.
+FEED_HOT_AUTHOR_FOLLOWERS = 10_000
+FEED_FAN_OUT_WORKERS = 4
+FEED_FAN_OUT_ASYNC = True
+
+# Schema served at /api/schema/, written by the build_schema command.
+OPENAPI_SCHEMA_PATH = BASE_DIR / 'openapi.yml'
@@ -14,21 +14,23 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView
-)
-
 from django.contrib import admin
 from django.urls import path, include
 
+from core import schema
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/schema/', SpectacularAPIView.as_view(), name='api-schema'),
+    path('api/schema/', schema.schema_view, name='api-schema'),
+    path(
+        'api/schema/<str:digest>/',
+        schema.hashed_schema_view,
+        name='api-schema-hashed',
+    ),
     path(
         'api/docs/',
-        SpectacularSwaggerView.as_view(url_name='api-schema'),
+        schema.SwaggerView.as_view(),
         name='api-docs',
         ),
     path('api/user/', include('user.urls')),
@@ -1,3 +1,82 @@
+"""
+Django admin pages for blogs, comments and tags.
+
+Changelists are built to stay fast on large tables: related rows are
+joined rather than fetched per row, foreign keys use raw id widgets
+instead of loading every user or blog into a select, large counts are
+planner estimates, and search and sorting only use indexed columns.
+"""
 from django.contrib import admin
+from django.db.models.functions import Lower
+
+from blog.search import search
+from core.counting import EstimatedCountPaginator
+from core.models import Blog, Comment, Tag
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Admin defaults for tables with millions of rows."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ['-id']
+    sortable_by = ['id']
+
+
+@admin.register(Blog)
+class BlogAdmin(LargeTableAdmin):
+    """Define the admin pages for blogs."""
+    list_display = ['id', 'title', 'author', 'comments_count', 'created_at']
+    list_select_related = ['author']
+    list_filter = ['created_at']
+    sortable_by = ['id', 'created_at']
+    raw_id_fields = ['author']
+    autocomplete_fields = ['tags']
+    search_fields = ['title']
+    search_help_text = 'Full-text search of titles, excerpts and content.'
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search the full-text index instead of scanning the table."""
+        if not search_term:
+            return queryset, False
+
+        return search(queryset, search_term), False
+
+
+@admin.register(Comment)
+class CommentAdmin(LargeTableAdmin):
+    """Define the admin pages for comments."""
+    list_display = ['id', 'comment_text', 'author', 'blog', 'likes_count']
+    list_select_related = ['author', 'blog']
+    raw_id_fields = ['author', 'blog']
+    search_fields = ['blog__id']
+    search_help_text = 'Blog id.'
+
+    def get_search_results(self, request, queryset, search_term):
+        """Find the comments of a blog through the blog index."""
+        if not search_term:
+            return queryset, False
+        if not search_term.strip().isdigit():
+            return queryset.none(), False
+
+        return queryset.filter(blog_id=int(search_term)), False
+
+
+@admin.register(Tag)
+class TagAdmin(LargeTableAdmin):
+    """Define the admin pages for tags."""
+    list_display = ['id', 'name', 'blogs_count']
+    sortable_by = ['id', 'blogs_count']
+    search_fields = ['name']
+    search_help_text = 'Start of the name, in any case.'
+
+    def get_search_results(self, request, queryset, search_term):
+        """Match name prefixes through the case-insensitive name index."""
+        term = search_term.strip().lower()
+        if not term:
+            return queryset, False
 
-# Register your models here.
+        # A range rather than LIKE, which cannot use an expression index.
+        return queryset.alias(lower_name=Lower('name')).filter(
+            lower_name__gte=term,
+            lower_name__lt=term + '\U0010ffff',
+        ), False
@@ -0,0 +1,16 @@
+"""
+Url mappings for the async read views of the blog API.
+"""
+from django.urls import path
+
+from blog import async_views
+
+urlpatterns = [
+    path('blogs/', async_views.blog_list),
+    path('blogs/<int:pk>/', async_views.blog_detail),
+    path(
+        'blogs/<int:parent_lookup_blog>/comments/',
+        async_views.blog_comment_list,
+    ),
+    path('tags/', async_views.tag_list),
+]
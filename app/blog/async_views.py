@@ -0,0 +1,151 @@
+"""
+Async views for the public read endpoints of the blog API.
+
+Under ASGI these serve GET requests for blog lists and details, tag
+lists and the comments of a blog with the async ORM, so a request waiting
+on the database does not hold a worker thread. They reuse the viewsets'
+querysets, filters, pagination and serializers, so responses match the
+synchronous views, including the response cache and validators.
+Anything else, including errors and non-JSON formats, is handed to the
+synchronous view the request would otherwise have reached.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from django.urls import resolve
+from rest_framework.exceptions import APIException
+from rest_framework.renderers import JSONRenderer
+
+from blog import views
+from blog.cache import (
+    amay_be_stale,
+    aresponse_key,
+    cache_entry,
+    cached_response,
+)
+from blog.conditional import not_modified_response, set_validators
+
+SYNC_URLCONF = 'app.urls'
+
+
+async def call_sync_view(request, *args, **kwargs):
+    """Serve a request with the view of the synchronous URLconf."""
+    match = resolve(request.path_info, urlconf=SYNC_URLCONF)
+    return await sync_to_async(match.func)(
+        request,
+        *match.args,
+        **match.kwargs,
+    )
+
+
+async def list_data(view):
+    """Return the data of a list response."""
+    queryset = view.filter_queryset(view.get_queryset())
+    if view.paginator is None:
+        objs = [obj async for obj in queryset]
+        return view.get_serializer(objs, many=True).data
+
+    page = await view.paginator.apaginate_queryset(
+        queryset,
+        view.request,
+        view=view,
+    )
+    data = view.get_serializer(page, many=True).data
+    return view.paginator.get_paginated_response(data).data
+
+
+async def retrieve_data(view):
+    """Return the data of a detail response, or None if not found."""
+    queryset = view.filter_queryset(view.get_queryset())
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        obj = await queryset.filter(**{
+            view.lookup_field: view.kwargs[lookup_url_kwarg],
+        }).afirst()
+    except (TypeError, ValueError, ValidationError):
+        return None
+    if obj is None:
+        return None
+    view.check_object_permissions(view.request, obj)
+
+    return view.get_serializer(obj).data
+
+
+def async_read_view(viewset, action, get_data):
+    """Return an async view serving one read action of a viewset."""
+
+    async def view_func(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return await call_sync_view(request, *args, **kwargs)
+
+        view = viewset(action_map={'get': action})
+        view.args = args
+        view.kwargs = kwargs
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        try:
+            await sync_to_async(view.initial)(view.request, *args, **kwargs)
+            renderer = view.request.accepted_renderer
+            if not isinstance(renderer, JSONRenderer):
+                return await call_sync_view(request, *args, **kwargs)
+
+            key = None
+            if action in getattr(view, 'cached_actions', ()):
+                key = await aresponse_key(request)
+                cached = await cache.aget(key)
+                if cached is not None:
+                    return cached_response(request, cached)
+
+            validators = (None, None)
+            if action in getattr(view, 'conditional_actions', ()):
+                validators = await view.aget_validators()
+                if validators[0] is not None:
+                    response = not_modified_response(request, *validators)
+                    if response is not None:
+                        return response
+
+            data = await get_data(view)
+        except APIException:
+            data = None
+        if data is None:
+            return await call_sync_view(request, *args, **kwargs)
+
+        response = HttpResponse(
+            renderer.render(
+                data,
+                view.request.accepted_media_type,
+                {'request': view.request, 'view': view},
+            ),
+            content_type=renderer.media_type,
+        )
+        for name, value in view.headers.items():
+            response[name] = value
+        if validators[0] is not None:
+            set_validators(response, *validators)
+        if key is not None and not await amay_be_stale():
+            await cache.aset(
+                key,
+                cache_entry(response, validators),
+                settings.BLOG_CACHE_TIMEOUT,
+            )
+
+        return response
+
+    # Unsafe methods go on to the DRF views, which are exempt as well.
+    view_func.csrf_exempt = True
+    # Like DRF views, so middleware can tell which viewset serves it.
+    view_func.cls = viewset
+
+    return view_func
+
+
+blog_list = async_read_view(views.BlogViewSet, 'list', list_data)
+blog_detail = async_read_view(views.BlogViewSet, 'retrieve', retrieve_data)
+tag_list = async_read_view(views.TagViewSet, 'list', list_data)
+blog_comment_list = async_read_view(
+    views.BlogCommentViewSet,
+    'list',
+    list_data,
+)
@@ -0,0 +1,169 @@
+"""
+Versioned response cache for the blog APIs.
+
+Cached responses are keyed by a global version that is bumped whenever a
+blog, comment or tag changes, so stale entries are never read again and
+simply expire. This only needs get/set/incr and works with any Django
+cache backend, including local-memory and file-based caches.
+
+Responses read from a replica shortly after a change are not cached, as
+the replica may not have the change yet.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+from blog.conditional import not_modified_response, set_validators
+from core.routers import read_from_replica
+
+VERSION_KEY = 'blog:version'
+RECENT_CHANGE_KEY = 'blog:recent_change'
+
+
+def get_version():
+    """Return the current version of the blog data."""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Start from the clock so a lost counter never revives old entries.
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+
+    return version
+
+
+async def aget_version():
+    """Return the current version of the blog data, asynchronously."""
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, time.time_ns(), None)
+        version = await cache.aget(VERSION_KEY)
+
+    return version
+
+
+def bump_version():
+    """Invalidate every cached response."""
+    if settings.DATABASE_REPLICAS:
+        cache.set(RECENT_CHANGE_KEY, True, settings.REPLICA_LAG_SECONDS)
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        get_version()
+
+
+def bump_version_on_commit():
+    """Invalidate now and again once the current transaction commits.
+
+    The second bump drops responses cached from data read while the
+    transaction was still open.
+    """
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def may_be_stale():
+    """Return whether the current request read data replicas may lack."""
+    return read_from_replica() and cache.get(RECENT_CHANGE_KEY) is not None
+
+
+async def amay_be_stale():
+    """Return whether the current request read data replicas may lack."""
+    return (
+        read_from_replica()
+        and await cache.aget(RECENT_CHANGE_KEY) is not None
+    )
+
+
+def response_key(request):
+    """Return the cache key of the response to a request."""
+    path = request.get_full_path().encode()
+    digest = hashlib.md5(path, usedforsecurity=False).hexdigest()
+
+    return f'blog:response:{get_version()}:{digest}'
+
+
+async def aresponse_key(request):
+    """Return the cache key of the response to a request, asynchronously."""
+    path = request.get_full_path().encode()
+    digest = hashlib.md5(path, usedforsecurity=False).hexdigest()
+
+    return f'blog:response:{await aget_version()}:{digest}'
+
+
+def cached_response(request, cached):
+    """Return the response for a cache entry, or 304 Not Modified."""
+    content, content_type, etag, last_modified = cached
+    if etag is not None:
+        response = not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return response
+    response = HttpResponse(content, content_type=content_type)
+    if etag is not None:
+        set_validators(response, etag, last_modified)
+
+    return response
+
+
+def cache_entry(response, validators):
+    """Return the cache entry of a rendered response."""
+    etag, last_modified = validators
+    return (response.content, response['Content-Type'], etag, last_modified)
+
+
+class CachedResponseMixin:
+    """Serve rendered JSON responses of read actions from the cache.
+
+    Validators set by ConditionalGetMixin are cached along with the body,
+    so a cache hit answers conditional requests without any query.
+    """
+    cached_actions = ('list', 'retrieve')
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        """Return the cached response or call the handler to build it."""
+        self.response_cache_key = None
+        if (
+            self.action not in self.cached_actions
+            or request.accepted_renderer.format != 'json'
+        ):
+            return handler(request, *args, **kwargs)
+
+        key = response_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached_response(request, cached)
+        self.response_cache_key = key
+
+        return handler(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request,
+            response,
+            *args,
+            **kwargs,
+        )
+        key = getattr(self, 'response_cache_key', None)
+        if (
+            key is not None
+            and response.status_code == 200
+            and not may_be_stale()
+        ):
+            response.render()
+            validators = getattr(self, 'validators', (None, None))
+            cache.set(
+                key,
+                cache_entry(response, validators),
+                settings.BLOG_CACHE_TIMEOUT,
+            )
+
+        return response
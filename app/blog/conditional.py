@@ -0,0 +1,180 @@
+"""
+Conditional GET support for the blog APIs.
+
+Validators are computed from a narrow query over the rows a response
+renders, before any serialization happens, so unchanged resources are
+answered with 304 Not Modified at the cost of a single indexed query.
+"""
+import hashlib
+
+from django.core.exceptions import ValidationError
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class BaseConditionalMixin:
+    """Compute validators and answer conditional requests."""
+    conditional_actions = ('list', 'retrieve')
+    # Columns of the rendered rows that change whenever they do.
+    validator_fields = ('id', 'updated_at')
+
+    validators = (None, None)
+
+    def get_validator_annotations(self):
+        """Return extra per-row values covering rendered relations."""
+        return {}
+
+    def get_validator_queryset(self):
+        """Return the values of the rows the response renders.
+
+        Return None for a lookup value the field cannot hold, leaving
+        the view to answer 404.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        annotations = self.get_validator_annotations()
+        fields = set(self.validator_fields) - set(annotations)
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                queryset = queryset.filter(**{
+                    self.lookup_field: self.kwargs[lookup_url_kwarg],
+                })
+            except (TypeError, ValueError, ValidationError):
+                return None
+            return queryset.prefetch_related(None).values(
+                *fields,
+                **annotations,
+            )[:1]
+
+        fields.update(
+            field.lstrip('-')
+            for field in self.pagination_class().get_ordering(
+                self.request,
+                queryset,
+                self,
+            )
+        )
+        return queryset.prefetch_related(None).values(*fields, **annotations)
+
+    def get_validator_rows(self):
+        """Return the validator values of the rows the response renders."""
+        queryset = self.get_validator_queryset()
+        if queryset is None:
+            return [], ()
+        if self.action == 'retrieve':
+            return list(queryset), ()
+
+        paginator = self.pagination_class()
+        rows = paginator.paginate_queryset(queryset, self.request, view=self)
+        return rows, (paginator.has_next, paginator.has_previous)
+
+    async def aget_validator_rows(self):
+        """Return the validator rows, fetched with the async ORM."""
+        queryset = self.get_validator_queryset()
+        if queryset is None:
+            return [], ()
+        if self.action == 'retrieve':
+            return [row async for row in queryset], ()
+
+        paginator = self.pagination_class()
+        rows = await paginator.apaginate_queryset(
+            queryset,
+            self.request,
+            view=self,
+        )
+        return rows, (paginator.has_next, paginator.has_previous)
+
+    def get_validators(self):
+        """Return the ETag and Last-Modified timestamp of the response."""
+        return self.validators_from_rows(*self.get_validator_rows())
+
+    async def aget_validators(self):
+        """Return the validators, computed with the async ORM."""
+        return self.validators_from_rows(*await self.aget_validator_rows())
+
+    def validators_from_rows(self, rows, links):
+        """Return the ETag and Last-Modified timestamp of the given rows.
+
+        Last-Modified is only given for single resources: deleting a row
+        from a list does not move its latest modification time forward.
+        """
+        if self.action == 'retrieve' and not rows:
+            return None, None
+        rows = [sorted(row.items()) for row in rows]
+        digest = hashlib.md5(usedforsecurity=False)
+        for part in (rows, links, self.request.get_full_path(),
+                     self.request.accepted_media_type):
+            digest.update(repr(part).encode())
+        etag = f'"{digest.hexdigest()}"'
+
+        last_modified = None
+        if self.action == 'retrieve':
+            last_modified = int(max(
+                value.timestamp() for name, value in rows[0]
+                if name.endswith('updated_at') and value is not None
+            ))
+
+        return etag, last_modified
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        """Return 304 Not Modified or call the handler and add validators."""
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.validators = self.get_validators()
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        response = not_modified_response(request, etag, last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            set_validators(response, etag, last_modified)
+
+        return response
+
+
+class ConditionalListMixin(BaseConditionalMixin):
+    """Answer list requests with an ETag."""
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list,
+            request,
+            *args,
+            **kwargs,
+        )
+
+
+class ConditionalRetrieveMixin(BaseConditionalMixin):
+    """Answer retrieve requests with ETag and Last-Modified."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve,
+            request,
+            *args,
+            **kwargs,
+        )
+
+
+class ConditionalGetMixin(ConditionalRetrieveMixin, ConditionalListMixin):
+    """Answer list and retrieve requests with ETag and Last-Modified."""
+
+
+def not_modified_response(request, etag, last_modified=None):
+    """Return 304 Not Modified if the client's copy is current."""
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """Set the ETag and Last-Modified headers of a response."""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
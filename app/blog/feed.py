@@ -0,0 +1,146 @@
+"""
+Feeds of the posts of followed authors.
+
+Publishing a post writes a FeedEntry for each follower of its author
+once the transaction commits, on a background thread pool, so the
+request does not wait on the fan-out. Authors with at least
+FEED_HOT_AUTHOR_FOLLOWERS followers are skipped: their posts are read
+from the blog table when a follower loads the feed. Reads merge both
+sources by blog id, each with one indexed query, so a page costs the same
+at any depth and however many hot authors a user follows. When an author
+drops below the threshold, their latest BACKFILL_POSTS posts are fanned
+out, so posts published while they were hot stay in their followers'
+feeds. Older posts are not backfilled.
+"""
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from core.models import Blog, FeedEntry, Follow, User
+
+logger = logging.getLogger(__name__)
+
+FAN_OUT_BATCH_SIZE = 1_000
+BACKFILL_POSTS = 100
+
+
+def is_hot(author_id):
+    """Return whether an author's posts are read on demand."""
+    return User.objects.filter(
+        id=author_id,
+        followers_count__gte=settings.FEED_HOT_AUTHOR_FOLLOWERS,
+    ).exists()
+
+
+def fan_out(blog_id, author_id):
+    """Add a post to the feeds of its author's followers.
+
+    Return the number of feed entries written.
+    """
+    follower_ids = Follow.objects.filter(
+        author_id=author_id,
+    ).values_list('follower_id', flat=True).iterator(
+        chunk_size=FAN_OUT_BATCH_SIZE,
+    )
+    written = 0
+    batch = []
+    for follower_id in follower_ids:
+        batch.append(FeedEntry(user_id=follower_id, blog_id=blog_id))
+        if len(batch) == FAN_OUT_BATCH_SIZE:
+            FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            written += len(batch)
+            batch = []
+    if batch:
+        FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+
+    return written
+
+
+def run_logged(func, *args):
+    """Run a feed write from a worker thread."""
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Feed write %s%r failed.', func.__name__, args)
+    finally:
+        close_old_connections()
+
+
+@functools.lru_cache(maxsize=None)
+def get_executor():
+    """Return the thread pool running fan-outs."""
+    return ThreadPoolExecutor(
+        max_workers=settings.FEED_FAN_OUT_WORKERS,
+        thread_name_prefix='feed-fan-out',
+    )
+
+
+def backfill(author_id):
+    """Fan out the latest posts of an author.
+
+    Return the number of feed entries written.
+    """
+    blog_ids = Blog.objects.filter(
+        author_id=author_id,
+    ).order_by('-id').values_list('id', flat=True)[:BACKFILL_POSTS]
+
+    return sum(fan_out(blog_id, author_id) for blog_id in blog_ids)
+
+
+def run_on_commit(func, *args):
+    """Run a feed write once the current transaction commits."""
+
+    def schedule():
+        if settings.FEED_FAN_OUT_ASYNC:
+            get_executor().submit(run_logged, func, *args)
+        else:
+            func(*args)
+
+    transaction.on_commit(schedule)
+
+
+def publish(blog):
+    """Schedule the fan-out of a new post once it is committed."""
+    if is_hot(blog.author_id):
+        return
+
+    run_on_commit(fan_out, blog.id, blog.author_id)
+
+
+def unfollowed(author_id):
+    """Schedule a backfill if an unfollow took an author below hot."""
+    cooled = User.objects.filter(
+        id=author_id,
+        followers_count=settings.FEED_HOT_AUTHOR_FOLLOWERS - 1,
+    ).exists()
+    if cooled:
+        run_on_commit(backfill, author_id)
+
+
+def feed_blog_ids(user, before=None, limit=20):
+    """Return the ids of the newest posts in a user's feed.
+
+    Only posts with an id below before are returned, newest first.
+    """
+    entries = FeedEntry.objects.filter(user=user)
+    if before is not None:
+        entries = entries.filter(blog_id__lt=before)
+    ids = set(entries.order_by('-blog_id').values_list(
+        'blog_id',
+        flat=True,
+    )[:limit])
+
+    hot_author_ids = Follow.objects.filter(
+        follower=user,
+        author__followers_count__gte=settings.FEED_HOT_AUTHOR_FOLLOWERS,
+    ).values('author_id')
+    blogs = Blog.objects.filter(author_id__in=hot_author_ids)
+    if before is not None:
+        blogs = blogs.filter(id__lt=before)
+    ids.update(blogs.order_by('-id').values_list('id', flat=True)[:limit])
+
+    return sorted(ids, reverse=True)[:limit]
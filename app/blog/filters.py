@@ -0,0 +1,82 @@
+"""
+Filter backends for the blog APIs.
+"""
+from django.db.models import Count
+from django.db.models.functions import Lower
+from rest_framework.filters import BaseFilterBackend
+
+from core.models import Blog
+from blog.search import search
+
+
+class BlogSearchFilter(BaseFilterBackend):
+    """Filter blogs with the full-text `search` query parameter."""
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        """Return the blogs matching the search terms, best first."""
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+
+        return search(queryset, term)
+
+    def get_schema_operation_parameters(self, view):
+        """Document the search parameter."""
+        return [{
+            'name': self.search_param,
+            'required': False,
+            'in': 'query',
+            'description': 'Full-text search over title, excerpt and content.',
+            'schema': {'type': 'string'},
+        }]
+
+
+class BlogTagFilter(BaseFilterBackend):
+    """Filter blogs by tag names with `tags` and `tags_match`.
+
+    Tags are matched by name ignoring case, through a subquery on the
+    blog-tag table so blogs are never joined into duplicate rows.
+    """
+    tags_param = 'tags'
+    match_param = 'tags_match'
+
+    def filter_queryset(self, request, queryset, view):
+        """Return the blogs with any or all of the requested tags."""
+        param = request.query_params.get(self.tags_param, '')
+        names = {
+            name.strip().lower()
+            for name in param.split(',')
+            if name.strip()
+        }
+        if not names:
+            return queryset
+
+        links = Blog.tags.through.objects.annotate(
+            tag_name=Lower('tag__name'),
+        ).filter(tag_name__in=names).values('blog_id')
+        if request.query_params.get(self.match_param) == 'all':
+            links = links.annotate(
+                matched=Count('tag_id'),
+            ).filter(matched=len(names)).values('blog_id')
+
+        return queryset.filter(id__in=links)
+
+    def get_schema_operation_parameters(self, view):
+        """Document the tag parameters."""
+        return [
+            {
+                'name': self.tags_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Comma separated tag names.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.match_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Match blogs with any (default) or all tags.',
+                'schema': {'type': 'string', 'enum': ['any', 'all']},
+            },
+        ]
@@ -0,0 +1,146 @@
+"""
+Django command comparing the async read path with the WSGI path.
+"""
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+
+from core.benchmark import percentile
+
+DEFAULT_PATHS = ['/api/blog/blogs/']
+
+
+def request_paths(paths, requests, nonce=None):
+    """Return the path of every request, unique ones given a nonce."""
+    targets = []
+    for i in range(requests):
+        path = paths[i % len(paths)]
+        if nonce is not None:
+            path += f"{'&' if '?' in path else '?'}_={nonce}-{i}"
+        targets.append(path)
+
+    return targets
+
+
+def run_wsgi(targets, concurrency, headers):
+    """Send the requests through the WSGI stack from a pool of threads."""
+
+    def worker(paths):
+        client = Client(HTTP_HOST='localhost', **headers)
+        latencies = []
+        try:
+            for path in paths:
+                start = time.perf_counter()
+                response = client.get(path)
+                latencies.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.status_code
+        finally:
+            connections.close_all()
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return [
+            latency
+            for latencies in executor.map(worker, (
+                targets[i::concurrency] for i in range(concurrency)
+            ))
+            for latency in latencies
+        ]
+
+
+async def run_asgi(targets, concurrency, headers):
+    """Send the requests to the ASGI application from concurrent tasks."""
+    from app.asgi import application
+
+    semaphore = asyncio.Semaphore(concurrency)
+    header_list = [(b'host', b'localhost')] + [
+        (name[5:].lower().replace('_', '-').encode(), value.encode())
+        for name, value in headers.items()
+    ]
+
+    async def request(path):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': path.split('?')[0],
+            'query_string': path.partition('?')[2].encode(),
+            'headers': header_list,
+            'server': ('localhost', 80),
+        }
+        async with semaphore:
+            start = time.perf_counter()
+            await application(scope, receive, send)
+            latency = time.perf_counter() - start
+        assert messages[0]['status'] == 200, messages[0]['status']
+        return latency
+
+    return await asyncio.gather(*(request(path) for path in targets))
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the async read views."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            help=(
+                'Path to request, may be repeated. Defaults to the blog list.'
+            ),
+        )
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=10)
+        parser.add_argument(
+            '--token',
+            help='Token to authenticate the requests with.',
+        )
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='Make every request miss the response cache.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        paths = options['paths'] or DEFAULT_PATHS
+        requests = options['requests']
+        concurrency = options['concurrency']
+        headers = {}
+        if options['token']:
+            headers['HTTP_AUTHORIZATION'] = f"Token {options['token']}"
+
+        for name, run in (
+                ('wsgi', run_wsgi),
+                ('asgi', lambda *args: asyncio.run(run_asgi(*args))),
+        ):
+            targets = request_paths(
+                paths,
+                requests,
+                name if options['cold'] else None,
+            )
+            start = time.perf_counter()
+            latencies = run(targets, concurrency, headers)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f'{name}: {requests} requests, concurrency {concurrency}, '
+                f'{requests / elapsed:.1f} req/s, '
+                f'p50 {statistics.median(latencies) * 1000:.1f} ms, '
+                f'p99 {percentile(latencies, 0.99) * 1000:.1f} ms'
+            )
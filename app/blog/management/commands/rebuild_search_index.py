@@ -0,0 +1,17 @@
+"""
+Django command to rebuild the blog full-text search index.
+"""
+from django.core.management.base import BaseCommand
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    """Django command to rebuild the search index."""
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        count = rebuild_index()
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {count} blog(s).')
+        )
@@ -0,0 +1,175 @@
+"""
+Pagination for the blog APIs.
+"""
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor,
+    CursorPagination,
+    _reverse_ordering,
+)
+from rest_framework.response import Response
+
+
+class AsyncCursorPaginationMixin:
+    """Cursor pagination that can also fetch its page with the async ORM.
+
+    This is CursorPagination.paginate_queryset split around the one
+    query it runs, so both paths share the cursor handling.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a page of the queryset."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Return a page of the queryset, fetched with the async ORM."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+
+        return self.set_page([obj async for obj in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the slice of the queryset holding the page and one more."""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            order = self.ordering[0]
+            is_reversed = order.startswith('-')
+            order_attr = order.lstrip('-')
+            if self.cursor.reverse != is_reversed:
+                kwargs = {order_attr + '__lt': current_position}
+            else:
+                kwargs = {order_attr + '__gt': current_position}
+            queryset = queryset.filter(**kwargs)
+
+        return queryset[offset:offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """Keep the page out of the fetched rows and work out its links."""
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1],
+                self.ordering,
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+class IdCursorPagination(AsyncCursorPaginationMixin, CursorPagination):
+    """Keyset pagination over the newest rows first.
+
+    Pages are located with an indexed `id < cursor` lookup instead of an
+    OFFSET, so deep pages cost the same as the first one.
+    """
+    ordering = '-id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class TagCursorPagination(IdCursorPagination):
+    """Keyset pagination for tags in reverse alphabetical order."""
+    ordering = '-name'
+
+
+class BlogCursorPagination(IdCursorPagination):
+    """Keyset pagination for blogs, best matches first when searching."""
+
+    def get_ordering(self, request, queryset, view):
+        """Order search results by rank, then newest first."""
+        if 'search_rank' in queryset.query.annotations:
+            return ('-search_rank', '-id')
+
+        return super().get_ordering(request, queryset, view)
+
+
+class FeedCursorPagination(IdCursorPagination):
+    """Keyset pagination of a feed, newest posts first.
+
+    The page is fetched by a function of the cursor position and a limit
+    rather than from a queryset, and only moves forward.
+    """
+
+    def paginate_feed(self, fetch_ids, request):
+        """Return the blog ids of a page, given fetch_ids(before, limit)."""
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        before = None
+        if self.cursor is not None:
+            try:
+                before = int(self.cursor.position)
+            except (TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+        ids = fetch_ids(before, self.page_size + 1)
+        self.page = ids[:self.page_size]
+        self.has_next = len(ids) > self.page_size
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(
+            offset=0,
+            reverse=False,
+            position=self.page[-1],
+        ))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
@@ -0,0 +1,127 @@
+"""
+Full-text search over blogs.
+
+SQLite databases keep an FTS5 table mirroring the searchable columns,
+keyed by blog id. PostgreSQL databases keep a weighted tsvector column
+on the blog table behind a GIN index. Both are created by the core
+migrations and kept current by blog.signals. Other databases fall back
+to unranked substring matching.
+"""
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import FloatField, Value
+from django.db.models.expressions import RawSQL
+
+from core.models import Blog
+
+SQLITE_TABLE = 'core_blog_search'
+# Relative weights of title, excerpt and content matches.
+SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+POSTGRES_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(excerpt, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+)
+
+
+def _sqlite_query(term):
+    """Return an FTS5 query matching all words of the term."""
+    return ' '.join(f'"{word}"' for word in re.findall(r'\w+', term))
+
+
+def index_blog(blog, using=DEFAULT_DB_ALIAS):
+    """Add or refresh a blog in the search index of a database."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s',
+                [blog.id],
+            )
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, title, excerpt, content) '
+                'VALUES (%s, %s, %s, %s)',
+                [blog.id, blog.title, blog.excerpt, blog.content],
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f'UPDATE {Blog._meta.db_table} '
+                f'SET search_vector = {POSTGRES_VECTOR} WHERE id = %s',
+                [blog.id],
+            )
+
+
+def unindex_blog(blog_id, using=DEFAULT_DB_ALIAS):
+    """Remove a blog from the search index of a database."""
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s',
+                [blog_id],
+            )
+
+
+def rebuild_index(using=DEFAULT_DB_ALIAS):
+    """Rebuild the whole search index, return the number of blogs."""
+    connection = connections[using]
+    table = Blog._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, title, excerpt, content) '
+                f'SELECT id, title, excerpt, content FROM {table}'
+            )
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} ({SQLITE_TABLE}) '
+                "VALUES ('optimize')"
+            )
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f'UPDATE {table} SET search_vector = {POSTGRES_VECTOR}'
+            )
+
+    return Blog.objects.using(using).count()
+
+
+def search(queryset, term):
+    """Filter blogs matching the term, annotated with `search_rank`.
+
+    Higher ranks are better matches.
+    """
+    table = Blog._meta.db_table
+    connection = connections[queryset.db]
+    if connection.vendor == 'sqlite':
+        query = _sqlite_query(term)
+        if not query:
+            return queryset.none()
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        matches = RawSQL(
+            f'SELECT rowid FROM {SQLITE_TABLE} WHERE {SQLITE_TABLE} MATCH %s',
+            [query],
+        )
+        rank = RawSQL(
+            f'SELECT -bm25({SQLITE_TABLE}, {weights}) FROM {SQLITE_TABLE} '
+            f'WHERE {SQLITE_TABLE} MATCH %s AND rowid = {table}.id',
+            [query],
+            output_field=FloatField(),
+        )
+    elif connection.vendor == 'postgresql':
+        ts_query = "websearch_to_tsquery('english', %s)"
+        matches = RawSQL(
+            f'SELECT id FROM {table} WHERE search_vector @@ {ts_query}',
+            [term],
+        )
+        rank = RawSQL(
+            f'ts_rank({table}.search_vector, {ts_query})',
+            [term],
+            output_field=FloatField(),
+        )
+    else:
+        return queryset.filter(title__icontains=term).annotate(
+            search_rank=Value(0.0, output_field=FloatField()),
+        )
+
+    return queryset.filter(id__in=matches).annotate(search_rank=rank)
@@ -1,24 +1,89 @@
 """
 Serializer for blog APIs.
 """
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
 from core.models import (
     Blog,
     Tag,
     Comment,
 )
+from core.timing import TimedSerializerMixin
+from blog.pagination import IdCursorPagination
+
+
+# Comments embedded in a blog: the first page of its comments endpoint.
+COMMENTS_PREVIEW_SIZE = IdCursorPagination.page_size
+
+
+def requested_fields(request, param):
+    """Return the comma separated field names given in a query param."""
+    value = request.query_params.get(param, '')
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """Trim representations to `?fields=` and opt-in `?include=` fields.
+
+    Fields listed in `optional_fields` are only rendered when asked for
+    through either query param. Write requests always get every field.
+    """
+    optional_fields = []
 
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
 
-class TagSerializer(serializers.ModelSerializer):
+        only = requested_fields(request, 'fields')
+        include = requested_fields(request, 'include') | only
+        for name in self.optional_fields:
+            if name not in include:
+                fields.pop(name, None)
+        if only:
+            for name in set(fields) - only:
+                fields.pop(name)
+
+        return fields
+
+
+class TagSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializers for tags."""
     class Meta:
         model = Tag
         fields = ['id', 'name']
         read_only_fields = ['id']
 
+    def validate_name(self, value):
+        """Reject names already taken in any letter case."""
+        if self.root is not self:
+            # Nested in a blog, where existing tags are reused.
+            return value
+        tags = Tag.objects.annotate(name_lower=Lower('name'))
+        if self.instance is not None:
+            tags = tags.exclude(id=self.instance.id)
+        if tags.filter(name_lower=value.lower()).exists():
+            raise serializers.ValidationError('Tag already exists.')
+
+        return value
+
+
+class TagCountSerializer(TagSerializer):
+    """Serializer for tags with the number of blogs using them."""
+    class Meta(TagSerializer.Meta):
+        fields = TagSerializer.Meta.fields + ['blogs_count']
+        read_only_fields = TagSerializer.Meta.read_only_fields + [
+            'blogs_count',
+        ]
+
 
-class CommentPostSerializer(serializers.ModelSerializer):
+class CommentPostSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for comments."""
     class Meta:
         model = Comment
@@ -31,6 +96,7 @@ class CommentPostSerializer(serializers.ModelSerializer):
             ]
         read_only_fields = [
             'id',
+            'likes_count',
             ]
 
     def create(self, validated_data):
@@ -39,7 +105,7 @@ class CommentPostSerializer(serializers.ModelSerializer):
 
         return comment
     
-class CommentPutSerializer(serializers.ModelSerializer):
+class CommentPutSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for comments."""
     class Meta:
         model = Comment
@@ -50,6 +116,7 @@ class CommentPutSerializer(serializers.ModelSerializer):
             ]
         read_only_fields = [
             'id',
+            'likes_count',
             'author',
             'blog'
             ]
@@ -62,10 +129,20 @@ class CommentPutSerializer(serializers.ModelSerializer):
 
 
 
-class BlogSerializer(serializers.ModelSerializer):
+class CommentLikeSerializer(serializers.Serializer):
+    """Serializer for the outcome of liking a comment."""
+    liked = serializers.BooleanField()
+    likes_count = serializers.IntegerField()
+
+
+class BlogSerializer(
+    TimedSerializerMixin,
+    SparseFieldsetMixin,
+    serializers.ModelSerializer,
+):
     """Serializer for Blog."""
     tags = TagSerializer(many=True, required=False)
-    comments = CommentPostSerializer(many=True, required=False)
+    comments = serializers.SerializerMethodField()
     class Meta:
         model = Blog
         fields = [
@@ -74,22 +151,79 @@ class BlogSerializer(serializers.ModelSerializer):
             'excerpt',
             'content',
             'tags',
-            'comments'
+            'comments',
+            'comments_count',
         ]
-        read_only_fields = ['id']
+        read_only_fields = ['id', 'comments_count']
+
+    @extend_schema_field(CommentPostSerializer(many=True))
+    def get_comments(self, blog):
+        """Return the first page of the blog's comments, newest first."""
+        comments = getattr(blog, 'recent_comments', None)
+        if comments is None:
+            comments = blog.comments.order_by('-id')[:COMMENTS_PREVIEW_SIZE]
+
+        return CommentPostSerializer(
+            comments,
+            many=True,
+            context=self.context,
+        ).data
 
-    def _get_or_create_tags(self, tags, blog):
-        """Handle  getting or creating tags as needed."""
+    def _find_tags(self, names):
+        """Return existing tags matching the names in any letter case."""
+        return {
+            tag.name.lower(): tag
+            for tag in Tag.objects.annotate(
+                name_lower=Lower('name'),
+            ).filter(name_lower__in=names)
+        }
+
+    def _get_or_create_tags(self, tags):
+        """Return tags for the given names, inserting missing ones in bulk.
+
+        Names match existing tags regardless of letter case.
+        """
+        names = {}
         for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                **tag,
+            names.setdefault(tag['name'].lower(), tag['name'])
+        found = self._find_tags(names)
+        missing = {
+            key: name for key, name in names.items() if key not in found
+        }
+        if missing:
+            Tag.objects.bulk_create(
+                [Tag(name=name) for name in missing.values()],
+                ignore_conflicts=True,
             )
-            blog.tags.add(tag_obj)
+            found.update(self._find_tags(missing))
+            for key in missing.keys() - found.keys():
+                # The database folds case differently, e.g. SQLite's
+                # ASCII-only LOWER(), so fall back to the exact name.
+                found[key] = Tag.objects.get(name=missing[key])
+
+        return [found[key] for key in names]
 
     def create(self, validated_data):
         """Create a Blog."""
         tags = validated_data.pop('tags', [])
-        blog = Blog.objects.create(**validated_data)
-        self._get_or_create_tags(tags, blog)
+        with transaction.atomic():
+            blog = Blog.objects.create(**validated_data)
+            if tags:
+                blog.tags.add(*self._get_or_create_tags(tags))
+
+        return blog
+
+    def update(self, instance, validated_data):
+        """Update a Blog, replacing its tags when given."""
+        tags = validated_data.pop('tags', None)
+        with transaction.atomic():
+            blog = super().update(instance, validated_data)
+            if tags is not None:
+                blog.tags.set(self._get_or_create_tags(tags))
+
+        return blog
+
 
-        return blog
\ No newline at end of file
+class BlogListSerializer(BlogSerializer):
+    """Serializer for the blog list, leaving out the body by default."""
+    optional_fields = ['content', 'comments']
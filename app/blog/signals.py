@@ -0,0 +1,42 @@
+"""
+Signal handlers invalidating the blog response cache and maintaining the
+search index.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Blog, Comment, CommentLike, Tag
+from blog.cache import bump_version_on_commit
+from blog.search import index_blog, unindex_blog
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=CommentLike)
+@receiver(post_delete, sender=CommentLike)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_responses(sender, **kwargs):
+    """Invalidate cached responses when blog data changes."""
+    bump_version_on_commit()
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def invalidate_responses_on_tagging(sender, action, **kwargs):
+    """Invalidate cached responses when blogs are tagged or untagged."""
+    if action.startswith('post_'):
+        bump_version_on_commit()
+
+
+@receiver(post_save, sender=Blog)
+def index_saved_blog(sender, instance, using, **kwargs):
+    """Refresh the search index entry of a saved blog."""
+    index_blog(instance, using)
+
+
+@receiver(post_delete, sender=Blog)
+def unindex_deleted_blog(sender, instance, using, **kwargs):
+    """Remove a deleted blog from the search index."""
+    unindex_blog(instance.id, using)
@@ -0,0 +1,64 @@
+"""
+Streaming JSON exports for the blog APIs.
+
+Rows are read with a chunked iterator and serialized one chunk at a
+time, so memory use stays flat however large the table is. Under ASGI
+the chunks are produced on the sync thread and streamed from an async
+iterator, as Django reads a sync iterator to the end before sending it.
+"""
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import action
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def iter_json(queryset, serialize, chunk_size):
+    """Yield a JSON array of the serialized rows, chunk by chunk."""
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    yield '['
+    chunk = []
+    separator = ''
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) < chunk_size:
+            continue
+        for data in serialize(chunk):
+            yield separator + encoder.encode(data)
+            separator = ','
+        chunk = []
+    for data in serialize(chunk):
+        yield separator + encoder.encode(data)
+        separator = ','
+    yield ']'
+
+
+async def aiter_chunks(parts, chunk_size):
+    """Yield the parts of a sync iterator, read chunk_size at a time."""
+    next_chunk = sync_to_async(lambda: list(islice(parts, chunk_size)))
+    while chunk := await next_chunk():
+        for part in chunk:
+            yield part
+
+
+class StreamingExportMixin:
+    """Add an `export` action streaming every row as one JSON array."""
+    export_chunk_size = 500
+
+    @extend_schema(filters=True)
+    @action(methods=['GET'], detail=False, pagination_class=None)
+    def export(self, request, *args, **kwargs):
+        """Stream all rows as a JSON array."""
+        queryset = self.filter_queryset(self.get_queryset())
+
+        def serialize(chunk):
+            return self.get_serializer(chunk, many=True).data
+
+        content = iter_json(queryset, serialize, self.export_chunk_size)
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_chunks(content, self.export_chunk_size)
+
+        return StreamingHttpResponse(content, content_type='application/json')
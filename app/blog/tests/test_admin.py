@@ -0,0 +1,176 @@
+"""
+Tests for the blog admin pages.
+"""
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Blog, Comment, Tag
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_blog(author, **params):
+    """Create and return sample blog."""
+    defaults = {
+        'title': 'Sample blog title',
+        'excerpt': 'Sample blog excerpt.',
+        'content': 'This content is a Sample blog content.'
+    }
+    defaults.update(**params)
+
+    return Blog.objects.create(author=author, **defaults)
+
+
+class BlogAdminTests(TestCase):
+    """Test the admin pages of blogs, comments and tags."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin_user = get_user_model().objects.create_superuser(
+            email='admin@example.com',
+            password='testpass123',
+        )
+        self.client.force_login(self.admin_user)
+        self.user = create_user(email='user@example.com', password='test123')
+
+    def create_rows(self, count):
+        """Create count blogs, each with a tag and a comment."""
+        start = Blog.objects.count()
+        for i in range(start, start + count):
+            blog = create_blog(self.user, title=f'Blog {i}')
+            blog.tags.add(Tag.objects.create(name=f'tag-{i}'))
+            Comment.objects.create(
+                author=self.user,
+                blog=blog,
+                comment_text=f'Comment {i}',
+            )
+
+    def changelist_queries(self, name):
+        """Return the number of queries a changelist runs."""
+        with CaptureQueriesContext(connection) as context:
+            res = self.client.get(reverse(f'admin:core_{name}_changelist'))
+        self.assertEqual(res.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_changelist_queries_constant(self):
+        """Test changelists run as many queries for few rows as for many."""
+        self.create_rows(2)
+        few = {
+            name: self.changelist_queries(name)
+            for name in ('blog', 'comment', 'tag')
+        }
+
+        self.create_rows(20)
+        many = {
+            name: self.changelist_queries(name)
+            for name in ('blog', 'comment', 'tag')
+        }
+
+        self.assertEqual(few, many)
+
+    def test_changelist_skips_full_count(self):
+        """Test changelists do not count the unfiltered table twice."""
+        self.create_rows(3)
+
+        res = self.client.get(
+            reverse('admin:core_blog_changelist'),
+            {'q': 'blog'},
+        )
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIsNone(res.context['cl'].full_result_count)
+
+    def test_blog_search_uses_full_text_index(self):
+        """Test blog search matches words anywhere in the blog."""
+        match = create_blog(self.user, content='Brewing coffee at home.')
+        create_blog(self.user, content='Brewing tea at home.')
+
+        res = self.client.get(
+            reverse('admin:core_blog_changelist'),
+            {'q': 'coffee'},
+        )
+
+        self.assertEqual(list(res.context['cl'].result_list), [match])
+
+    def test_comment_search_by_blog(self):
+        """Test comments are found by the id of their blog."""
+        self.create_rows(2)
+        blog = Blog.objects.first()
+        url = reverse('admin:core_comment_changelist')
+
+        res = self.client.get(url, {'q': blog.id})
+        other = self.client.get(url, {'q': 'text'})
+
+        self.assertEqual(
+            list(res.context['cl'].result_list),
+            list(blog.comments.all()),
+        )
+        self.assertEqual(list(other.context['cl'].result_list), [])
+
+    def test_tag_search_by_name_prefix(self):
+        """Test tags are found by the start of their name, in any case."""
+        Tag.objects.create(name='Django')
+        Tag.objects.create(name='Python')
+        Tag.objects.create(name='Web django')
+        url = reverse('admin:core_tag_changelist')
+
+        res = self.client.get(url, {'q': 'DJ'})
+
+        self.assertEqual(
+            [tag.name for tag in res.context['cl'].result_list],
+            ['Django'],
+        )
+
+    def test_change_pages_use_raw_id_widgets(self):
+        """Test forms do not list every user or blog in a select."""
+        self.create_rows(1)
+        comment = Comment.objects.get()
+
+        blog_res = self.client.get(
+            reverse('admin:core_blog_change', args=[comment.blog_id]),
+        )
+        comment_res = self.client.get(
+            reverse('admin:core_comment_change', args=[comment.id]),
+        )
+
+        self.assertContains(blog_res, 'vForeignKeyRawIdAdminField')
+        self.assertContains(blog_res, 'admin-autocomplete')
+        self.assertContains(comment_res, 'vForeignKeyRawIdAdminField', 2)
+
+    def test_tag_autocomplete(self):
+        """Test tags can be searched from the blog form."""
+        self.create_rows(2)
+
+        res = self.client.get(reverse('admin:autocomplete'), {
+            'app_label': 'core',
+            'model_name': 'blog',
+            'field_name': 'tags',
+            'term': 'tag-1',
+        })
+
+        self.assertEqual(
+            [result['text'] for result in res.json()['results']],
+            ['tag-1'],
+        )
+
+    @skipUnless(connection.vendor == 'sqlite', 'Needs sqlite statistics.')
+    @override_settings(ESTIMATED_COUNT_THRESHOLD=3)
+    def test_count_estimated_from_statistics(self):
+        """Test unfiltered changelists count rows from planner statistics."""
+        self.create_rows(3)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.create_rows(2)
+
+        res = self.client.get(reverse('admin:core_blog_changelist'))
+
+        self.assertEqual(res.context['cl'].result_count, 3)
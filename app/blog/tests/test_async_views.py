@@ -0,0 +1,261 @@
+"""
+Tests for the async read views of the blog API.
+"""
+import json
+import warnings
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from core.models import Blog, Comment, Tag
+
+from blog import async_views
+
+
+BLOG_URL = reverse('blog:blog-list')
+TAGS_URL = reverse('blog:tag-list')
+
+
+def detail_url(blog_id):
+    """Create and return a blog detail URL."""
+    return reverse('blog:blog-detail', args=[blog_id])
+
+
+def blog_comments_url(blog_id):
+    """Create and return a blog's comments URL."""
+    return reverse('blog:blog-comment-list', args=[blog_id])
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_blog(author, **params):
+    """Create and return sample blog."""
+    defaults = {
+        'title': 'Sample blog title',
+        'excerpt': 'Sample blog excerpt.',
+        'content': 'This content is a Sample blog content.'
+    }
+    defaults.update(**params)
+
+    return Blog.objects.create(author=author, **defaults)
+
+
+@override_settings(ROOT_URLCONF='app.asgi_urls')
+class AsyncReadViewTests(TestCase):
+    """Test the async views answer like the synchronous ones."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = create_user(email='user@example.com', password='test123')
+        self.token = Token.objects.create(user=self.user)
+        self.sync_client = APIClient()
+        self.sync_client.credentials(HTTP_AUTHORIZATION=f'Token {self.token}')
+        self.async_client = AsyncClient()
+        self.headers = {'Authorization': f'Token {self.token}'}
+        tag = Tag.objects.create(name='Django')
+        self.blogs = [create_blog(author=self.user) for _ in range(3)]
+        self.blogs[0].tags.add(tag)
+        for _ in range(2):
+            Comment.objects.create(
+                comment_text='Comment',
+                author=self.user,
+                blog=self.blogs[0],
+            )
+
+    async def assertSameResponse(self, url, data=None):
+        """Assert the async view answers a GET like the sync view."""
+        sync_calls = []
+
+        async def call_sync_view(*args, **kwargs):
+            sync_calls.append(args)
+
+        expected = await sync_to_async(self.sync_client.get)(url, data)
+        await cache.aclear()
+        with patch.object(async_views, 'call_sync_view', call_sync_view):
+            res = await self.async_client.get(url, data, headers=self.headers)
+
+        self.assertEqual(sync_calls, [])
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res['Content-Type'], expected['Content-Type'])
+        self.assertEqual(json.loads(res.content), json.loads(expected.content))
+        self.assertEqual(res.get('ETag'), expected.get('ETag'))
+        self.assertEqual(
+            res.get('Last-Modified'),
+            expected.get('Last-Modified'),
+        )
+
+    async def test_blog_list(self):
+        """Test listing blogs asynchronously."""
+        await self.assertSameResponse(BLOG_URL)
+        await self.assertSameResponse(
+            BLOG_URL,
+            {'include': 'comments,content', 'page_size': 2},
+        )
+        await self.assertSameResponse(BLOG_URL, {'tags': 'django'})
+
+    async def test_blog_list_next_page(self):
+        """Test following the cursor of an async blog list."""
+        res = await self.async_client.get(
+            BLOG_URL,
+            {'page_size': 2},
+            headers=self.headers,
+        )
+
+        await self.assertSameResponse(json.loads(res.content)['next'])
+
+    async def test_blog_detail(self):
+        """Test retrieving a blog asynchronously."""
+        await self.assertSameResponse(detail_url(self.blogs[0].id))
+
+    async def test_tag_list(self):
+        """Test listing tags asynchronously."""
+        await self.assertSameResponse(TAGS_URL, {'with_counts': 1})
+
+    async def test_blog_comment_list(self):
+        """Test listing a blog's comments asynchronously."""
+        await self.assertSameResponse(blog_comments_url(self.blogs[0].id))
+
+    async def test_blog_detail_not_modified_and_cached(self):
+        """Test async responses are cached and answer conditional requests."""
+        url = detail_url(self.blogs[0].id)
+        res = await self.async_client.get(url, headers=self.headers)
+
+        res = await self.async_client.get(
+            url,
+            headers={**self.headers, 'If-None-Match': res['ETag']},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        await Blog.objects.filter(id=self.blogs[0].id).aupdate(title='Changed')
+        res = await self.async_client.get(url, headers=self.headers)
+
+        self.assertEqual(json.loads(res.content)['title'], 'Sample blog title')
+
+    async def test_errors_served_by_sync_views(self):
+        """Test errors are answered by the synchronous views."""
+        res = await self.async_client.get(detail_url(0), headers=self.headers)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = await self.async_client.get(
+            blog_comments_url(self.blogs[-1].id + 1),
+            headers=self.headers,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+        res = await AsyncClient().get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_writes_served_by_sync_views(self):
+        """Test unsafe methods reach the synchronous views."""
+        res = await self.async_client.post(
+            BLOG_URL,
+            {
+                'title': 'Async title',
+                'excerpt': 'Async excerpt.',
+                'content': 'Async content.',
+            },
+            headers=self.headers,
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(
+            await Blog.objects.filter(title='Async title').aexists()
+        )
+
+
+class ASGIApplicationTests(TestCase):
+    """Test the ASGI application routes reads to the async views."""
+
+    async def test_application_uses_async_views(self):
+        """Test the ASGI application serves the blog list asynchronously."""
+        from app.asgi import application
+
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': BLOG_URL,
+            'query_string': b'',
+            'headers': [(b'host', b'testserver')],
+            'server': ('testserver', 80),
+        }
+
+        async def call_sync_view(*args, **kwargs):
+            raise AssertionError('Served by the synchronous view.')
+
+        with patch.object(async_views, 'call_sync_view', call_sync_view):
+            await application(scope, receive, send)
+
+        self.assertEqual(messages[0]['status'], status.HTTP_200_OK)
+        self.assertEqual(json.loads(messages[1]['body'])['results'], [])
+
+    async def test_export_streams_asynchronously(self):
+        """Test exports are streamed chunk by chunk under ASGI."""
+        from app.asgi import application
+        from blog.views import BlogViewSet
+
+        user = await sync_to_async(create_user)(
+            email='user@example.com',
+            password='testpass123',
+        )
+        token = await Token.objects.acreate(user=user)
+        blogs = [await sync_to_async(create_blog)(author=user)
+                 for _ in range(5)]
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': reverse('blog:blog-export'),
+            'query_string': b'',
+            'headers': [
+                (b'host', b'testserver'),
+                (b'authorization', f'Token {token.key}'.encode()),
+            ],
+            'server': ('testserver', 80),
+        }
+
+        with patch.object(BlogViewSet, 'export_chunk_size', 2):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                await application(scope, receive, send)
+
+        self.assertEqual(messages[0]['status'], status.HTTP_200_OK)
+        # Django warns when it has to read a sync iterator to the end.
+        self.assertFalse([
+            warning for warning in caught
+            if 'synchronous iterators' in str(warning.message)
+        ])
+        body = b''.join(message.get('body', b'') for message in messages[1:])
+        self.assertEqual(
+            [blog['id'] for blog in json.loads(body)],
+            sorted((blog.id for blog in blogs), reverse=True),
+        )
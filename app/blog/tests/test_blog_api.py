@@ -1,10 +1,18 @@
 """
 Tests for blog APIs.
 """
+import json
+import tempfile
+from datetime import timedelta
+from unittest.mock import patch
+
 from PIL import Image
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
@@ -17,14 +25,17 @@ from core.models import (
 )
 
 from blog.serializers import (
-    BlogSerializer,
+    COMMENTS_PREVIEW_SIZE,
+    BlogListSerializer,
     )
+from blog.views import BlogViewSet
 
 
 BLOG_URL = reverse('blog:blog-list')
 
 def blog_comments_url(blog_id):
-    return reverse('blog:comment-list', args=blog_id)
+    """Create and return a blog's comments URL."""
+    return reverse('blog:blog-comment-list', args=[blog_id])
 
 def detail_url(blog_id):
     """Create and return a blog detail URL."""
@@ -52,6 +63,7 @@ class PublicBlogAPITests(TestCase):
     """Test unauthenticated API requests."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = create_user(email='user@example.com', password='test123')
 
@@ -63,18 +75,270 @@ class PublicBlogAPITests(TestCase):
         res = self.client.get(BLOG_URL)
 
         blogs = Blog.objects.all().order_by('-id')
-        serializer = BlogSerializer(blogs, many=True)
-        self.assertEqual(res.data, serializer.data)
+        serializer = BlogListSerializer(blogs, many=True)
+        expected = [
+            {k: v for k, v in blog.items() if k not in ('content', 'comments')}
+            for blog in serializer.data
+        ]
+        self.assertEqual(res.data['results'], expected)
+
+    def test_blog_list_defers_content(self):
+        """Test the blog list leaves the content out of the query."""
+        create_blog(author=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(BLOG_URL)
+
+        self.assertNotIn('content', res.data['results'][0])
+        self.assertNotIn('comments', res.data['results'][0])
+        self.assertNotIn('"content"', queries[0]['sql'])
+
+    def test_blog_list_include_comments(self):
+        """Test comments and content are listed when included."""
+        blog = create_blog(author=self.user)
+        Comment.objects.create(
+            comment_text='Comment',
+            author=self.user,
+            blog=blog,
+            likes_count=0,
+        )
+
+        res = self.client.get(BLOG_URL, {'include': 'comments,content'})
+
+        self.assertEqual(res.data['results'][0]['content'], blog.content)
+        self.assertEqual(len(res.data['results'][0]['comments']), 1)
+
+    def test_blog_list_sparse_fields(self):
+        """Test only the requested fields are listed."""
+        blog = create_blog(author=self.user)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(BLOG_URL, {'fields': 'id,title'})
+
+        self.assertEqual(
+            res.data['results'],
+            [{'id': blog.id, 'title': blog.title}],
+        )
+
+    def test_blog_list_served_from_cache(self):
+        """Test repeating a blog list request runs no queries."""
+        blog = create_blog(author=self.user)
+        first = self.client.get(BLOG_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(BLOG_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.content, first.content)
+        self.assertEqual(res['ETag'], first['ETag'])
+        self.assertEqual(res.json()['results'][0]['id'], blog.id)
+
+    def test_blog_list_cache_invalidated_on_change(self):
+        """Test changing a blog, comment or tag refreshes the list."""
+        blog = create_blog(author=self.user)
+        self.client.get(BLOG_URL)
+
+        Comment.objects.create(comment_text='New', author=self.user, blog=blog)
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.json()['results'][0]['comments_count'], 1)
+
+        blog.tags.add(Tag.objects.create(name='Django'))
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.json()['results'][0]['tags'][0]['name'], 'Django')
+
+        Tag.objects.filter(name='Django').update(name='Python')
+        Tag.objects.get(name='Python').save()
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.json()['results'][0]['tags'][0]['name'], 'Python')
+
+        blog.delete()
+        res = self.client.get(BLOG_URL)
+        self.assertEqual(res.json()['results'], [])
+
+    def test_blog_list_cache_keyed_by_query(self):
+        """Test responses to different query strings are cached apart."""
+        create_blog(author=self.user)
+        self.client.get(BLOG_URL)
+
+        res = self.client.get(BLOG_URL, {'fields': 'id'})
+
+        self.assertEqual(list(res.json()['results'][0]), ['id'])
+
+    def test_blog_list_file_based_cache(self):
+        """Test responses are cached with the file-based backend."""
+        with tempfile.TemporaryDirectory() as location:
+            backend = 'django.core.cache.backends.filebased.FileBasedCache'
+            with override_settings(CACHES={'default': {
+                'BACKEND': backend,
+                'LOCATION': location,
+            }}):
+                blog = create_blog(author=self.user)
+                self.client.get(BLOG_URL)
+                with self.assertNumQueries(0):
+                    self.client.get(BLOG_URL)
+
+                blog.delete()
+                res = self.client.get(BLOG_URL)
+
+        self.assertEqual(res.json()['results'], [])
+
+    def test_blog_list_not_modified(self):
+        """Test an unchanged blog list is answered with 304."""
+        create_blog(author=self.user)
+        etag = self.client.get(BLOG_URL)['ETag']
+
+        with self.assertNumQueries(0):
+            res = self.client.get(BLOG_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b'')
+
+        cache.clear()
+        with self.assertNumQueries(1):
+            res = self.client.get(BLOG_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_blog_list_etag_changes_with_page(self):
+        """Test the blog list ETag changes with the rows on the page."""
+        blog = create_blog(author=self.user)
+        etag = self.client.get(BLOG_URL)['ETag']
+
+        Comment.objects.create(comment_text='New', author=self.user, blog=blog)
+        res = self.client.get(BLOG_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], etag)
+
+        etag = res['ETag']
+        blog.delete()
+        res = self.client.get(BLOG_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Last-Modified', res)
+
+    def test_blog_list_paginated_by_cursor(self):
+        """Test the blog list is split into cursor linked pages."""
+        blogs = [create_blog(author=self.user) for _ in range(3)]
+
+        res = self.client.get(BLOG_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [blog['id'] for blog in res.data['results']],
+            [blogs[2].id, blogs[1].id],
+        )
+        self.assertIsNone(res.data['previous'])
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [blog['id'] for blog in res.data['results']],
+            [blogs[0].id],
+        )
+        self.assertIsNone(res.data['next'])
+        self.assertIsNotNone(res.data['previous'])
+
+    def test_blog_list_filtered_by_tags(self):
+        """Test filtering blogs having any or all of the given tags."""
+        django = Tag.objects.create(name='Django')
+        python = Tag.objects.create(name='Python')
+        both = create_blog(author=self.user)
+        both.tags.add(django, python)
+        one = create_blog(author=self.user)
+        one.tags.add(python)
+        create_blog(author=self.user)
+
+        res = self.client.get(BLOG_URL, {'tags': 'django,PYTHON'})
+
+        self.assertEqual(
+            [blog['id'] for blog in res.data['results']],
+            [one.id, both.id],
+        )
+
+        res = self.client.get(
+            BLOG_URL,
+            {'tags': 'django,python', 'tags_match': 'all'},
+        )
+
+        self.assertEqual(
+            [blog['id'] for blog in res.data['results']],
+            [both.id],
+        )
+
+    def test_blog_list_filtered_by_tags_query_budget(self):
+        """Test filtering by tags adds no queries."""
+        tag = Tag.objects.create(name='Django')
+        create_blog(author=self.user).tags.add(tag)
+
+        with self.assertNumQueries(BlogViewSet.query_budget['list']):
+            res = self.client.get(
+                BLOG_URL,
+                {'tags': 'django', 'include': 'comments'},
+            )
+
+        self.assertEqual(len(res.data['results']), 1)
+
+    def test_blog_list_query_budget(self):
+        """Test listing blogs runs a constant number of queries."""
+        for count in (1, 10):
+            for i in range(count):
+                blog = create_blog(author=self.user)
+                blog.tags.add(Tag.objects.create(name=f'Tag {count}-{i}'))
+                Comment.objects.create(
+                    comment_text='Comment',
+                    author=self.user,
+                    blog=blog,
+                    likes_count=0,
+                )
+
+            with self.assertNumQueries(BlogViewSet.query_budget['list']):
+                res = self.client.get(BLOG_URL, {'include': 'comments'})
+
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
 
 
 class PrivateBlogAPITests(TestCase):
     """Test authenticated API requests."""
 
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.user = create_user(email='user@example.com', password='test123')
         self.client.force_authenticate(self.user)
 
+    def test_export_blogs_streams_all_rows(self):
+        """Test exporting blogs streams every blog as one JSON array."""
+        tag = Tag.objects.create(name='Django')
+        blogs = [create_blog(author=self.user) for _ in range(5)]
+        blogs[0].tags.add(tag)
+
+        with patch.object(BlogViewSet, 'export_chunk_size', 2):
+            res = self.client.get(reverse('blog:blog-export'))
+            body = b''.join(res.streaming_content)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.streaming)
+        data = json.loads(body)
+        self.assertEqual(
+            [blog['id'] for blog in data],
+            [blog.id for blog in reversed(blogs)],
+        )
+        self.assertEqual(data[-1]['tags'], [{'id': tag.id, 'name': 'Django'}])
+        self.assertEqual(data[0]['content'], blogs[-1].content)
+
+    def test_export_blogs_filtered(self):
+        """Test exporting blogs applies the list filters."""
+        tag = Tag.objects.create(name='Django')
+        blog = create_blog(author=self.user)
+        blog.tags.add(tag)
+        create_blog(author=self.user)
+
+        res = self.client.get(reverse('blog:blog-export'), {'tags': 'django'})
+        data = json.loads(b''.join(res.streaming_content))
+
+        self.assertEqual([row['id'] for row in data], [blog.id])
+
     def test_create_blog(self):
         """Test creating a blog."""
         payload = {
@@ -89,6 +353,103 @@ class PrivateBlogAPITests(TestCase):
             self.assertEqual(getattr(blog, k), v)
         self.assertEqual(blog.author, self.user)
 
+    def test_create_blog_with_new_tags(self):
+        """Test creating a blog with new tags."""
+        payload = {
+            'title': 'Sample blog title',
+            'excerpt': 'Sample blog excerpt.',
+            'content': 'This content is a Sample blog content.',
+            'tags': [{'name': 'Django'}, {'name': 'Python'}],
+        }
+        res = self.client.post(BLOG_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        blog = Blog.objects.get(id=res.data['id'])
+        self.assertEqual(
+            sorted(blog.tags.values_list('name', flat=True)),
+            ['Django', 'Python'],
+        )
+
+    def test_create_blog_with_existing_tag(self):
+        """Test creating a blog reuses existing tags."""
+        tag = Tag.objects.create(name='Django')
+        payload = {
+            'title': 'Sample blog title',
+            'excerpt': 'Sample blog excerpt.',
+            'content': 'This content is a Sample blog content.',
+            'tags': [
+                {'name': 'Django'},
+                {'name': 'Python'},
+                {'name': 'Django'},
+            ],
+        }
+        res = self.client.post(BLOG_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        blog = Blog.objects.get(id=res.data['id'])
+        self.assertIn(tag, blog.tags.all())
+        self.assertEqual(blog.tags.count(), 2)
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_create_blog_matches_tags_ignoring_case(self):
+        """Test tag names match existing tags in any letter case."""
+        tag = Tag.objects.create(name='Django')
+        payload = {
+            'title': 'Sample blog title',
+            'excerpt': 'Sample blog excerpt.',
+            'content': 'This content is a Sample blog content.',
+            'tags': [{'name': 'django'}, {'name': 'DJANGO'}],
+        }
+        res = self.client.post(BLOG_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        blog = Blog.objects.get(id=res.data['id'])
+        self.assertEqual(list(blog.tags.all()), [tag])
+        self.assertEqual(Tag.objects.count(), 1)
+
+    def test_create_blog_tag_queries_constant(self):
+        """Test creating a blog costs the same for one or many tags."""
+        counts = []
+        for tag_count in (1, 5):
+            payload = {
+                'title': 'Sample blog title',
+                'excerpt': 'Sample blog excerpt.',
+                'content': 'This content is a Sample blog content.',
+                'tags': [
+                    {'name': f'Tag {tag_count}-{i}'} for i in range(tag_count)
+                ],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(BLOG_URL, payload, format='json')
+            counts.append(len(queries))
+
+        self.assertEqual(counts[0], counts[1])
+
+    def test_update_blog_tags(self):
+        """Test updating a blog replaces its tags."""
+        blog = create_blog(author=self.user)
+        blog.tags.add(Tag.objects.create(name='Old'))
+
+        payload = {'tags': [{'name': 'New'}]}
+        res = self.client.patch(detail_url(blog.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(blog.tags.values_list('name', flat=True)),
+            ['New'],
+        )
+
+    def test_update_blog_clear_tags(self):
+        """Test updating a blog with an empty tag list clears them."""
+        blog = create_blog(author=self.user)
+        blog.tags.add(Tag.objects.create(name='Old'))
+
+        payload = {'tags': []}
+        res = self.client.patch(detail_url(blog.id), payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(blog.tags.count(), 0)
+
     def test_partial_update_blog(self):
         """Test updating a blog."""
         original_title = 'Original title'
@@ -168,8 +529,87 @@ class PrivateBlogAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
         self.assertTrue(Blog.objects.filter(id=blog.id).exists())
 
+    def test_retrieve_blog_query_budget(self):
+        """Test retrieving a blog runs a constant number of queries."""
+        blog = create_blog(author=self.user)
+        blog.tags.add(Tag.objects.create(name='Tag'))
+        for _ in range(5):
+            Comment.objects.create(
+                comment_text='Comment',
+                author=self.user,
+                blog=blog,
+                likes_count=0,
+            )
+
+        with self.assertNumQueries(BlogViewSet.query_budget['retrieve']):
+            res = self.client.get(detail_url(blog.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_blog_served_from_cache(self):
+        """Test repeating a blog detail request runs no queries."""
+        blog = create_blog(author=self.user)
+        self.client.get(detail_url(blog.id))
+
+        with self.assertNumQueries(0):
+            res = self.client.get(detail_url(blog.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.json()['id'], blog.id)
+
+    def test_retrieve_blog_conditional(self):
+        """Test retrieving an unchanged blog is answered with 304."""
+        blog = create_blog(author=self.user)
+        res = self.client.get(detail_url(blog.id))
+        self.assertIn('Last-Modified', res)
+
+        res = self.client.get(
+            detail_url(blog.id),
+            HTTP_IF_MODIFIED_SINCE=res['Last-Modified'],
+        )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        etag = res['ETag']
+        comment = Comment.objects.create(
+            comment_text='New',
+            author=self.user,
+            blog=blog,
+        )
+        res = self.client.get(detail_url(blog.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        etag = res['ETag']
+        Comment.objects.filter(id=comment.id).update(
+            comment_text='Edited',
+            updated_at=comment.updated_at + timedelta(seconds=1),
+        )
+        cache.clear()
+        res = self.client.get(detail_url(blog.id), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['comments'][0]['comment_text'], 'Edited')
+
+    def test_retrieve_missing_blog_not_found(self):
+        """Test retrieving a missing blog still returns 404."""
+        res = self.client.get(detail_url(1000))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retrieve_non_numeric_id_not_found(self):
+        """Test retrieving a blog by an id that is not a number."""
+        res = self.client.get(detail_url('abc'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retrieve_blog_sparse_fields(self):
+        """Test retrieving a blog with a sparse fieldset."""
+        blog = create_blog(author=self.user)
+
+        res = self.client.get(detail_url(blog.id), {'fields': 'id,content'})
+
+        self.assertEqual(res.data, {'id': blog.id, 'content': blog.content})
+
     def test_retrieving_blog_comments(self):
-        """Test retrieving all blog comments."""
+        """Test retrieving a blog embeds its newest comments."""
         user2 = create_user(email='user2@example.com', password='testpass123')
         blog = create_blog(author=self.user)
         comment1 = Comment.objects.create(
@@ -187,8 +627,27 @@ class PrivateBlogAPITests(TestCase):
 
         url = detail_url(blog_id=blog.id)
         res = self.client.get(url)
-        
+
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(res.data['comments']), 2)
-        self.assertEqual(Comment.objects.get(id=res.data['comments'][0]['author']).author, self.user)
-        self.assertEqual(Comment.objects.get(id=res.data['comments'][1]['author']).author, user2)
+        self.assertEqual(res.data['comments_count'], 2)
+        self.assertEqual(
+            [comment['id'] for comment in res.data['comments']],
+            [comment2.id, comment1.id],
+        )
+        self.assertEqual(res.data['comments'][0]['author'], user2.id)
+        self.assertEqual(res.data['comments'][1]['author'], self.user.id)
+
+    def test_retrieving_blog_embeds_first_comments_page(self):
+        """Test retrieving a blog embeds only the first page of comments."""
+        blog = create_blog(author=self.user)
+        for _ in range(COMMENTS_PREVIEW_SIZE + 1):
+            Comment.objects.create(
+                comment_text='Comment',
+                author=self.user,
+                blog=blog,
+            )
+
+        res = self.client.get(detail_url(blog.id))
+
+        self.assertEqual(res.data['comments_count'], COMMENTS_PREVIEW_SIZE + 1)
+        self.assertEqual(len(res.data['comments']), COMMENTS_PREVIEW_SIZE)
@@ -1,6 +1,8 @@
 """
 Test for comments API.
 """
+import json
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -11,9 +13,12 @@ from rest_framework.test import APIClient
 
 from core.models import (
     Comment,
+    CommentLike,
     Blog
 )
 
+from blog.views import BlogCommentViewSet, CommentViewSet
+
 
 COMMENT_URL = reverse('blog:comment-list')
 
@@ -21,8 +26,13 @@ def detail_url(comment_id):
     """Create and return a blog detail URL."""
     return reverse('blog:comment-detail', args=[comment_id])
 
+def like_url(comment_id):
+    """Create and return a comment like URL."""
+    return reverse('blog:comment-like', args=[comment_id])
+
 def blog_comments_url(blog_id):
-    return reverse('blog:comment-list', args=blog_id)
+    """Create and return a blog's comments URL."""
+    return reverse('blog:blog-comment-list', args=[blog_id])
 
 def create_user(email='user@example.com', password='testpass123'):
     return get_user_model().objects.create_user(email=email, password=password)
@@ -40,6 +50,95 @@ def create_blog(author, **params):
     return blog
 
 
+class PublicBlogCommentAPITests(TestCase):
+    """Test unauthenticated requests to a blog's comments."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+
+    def test_list_blog_comments(self):
+        """Test listing only the comments of one blog, newest first."""
+        blog = create_blog(author=self.user)
+        other_blog = create_blog(author=self.user)
+        comments = [
+            Comment.objects.create(
+                comment_text='This is a test comment.',
+                blog=blog,
+                author=self.user,
+                likes_count=0
+            )
+            for _ in range(3)
+        ]
+        Comment.objects.create(
+            comment_text='This is another blog comment.',
+            blog=other_blog,
+            author=self.user,
+            likes_count=0
+        )
+
+        with self.assertNumQueries(BlogCommentViewSet.query_budget['list']):
+            res = self.client.get(blog_comments_url(blog.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [comment['id'] for comment in res.data['results']],
+            [comment.id for comment in reversed(comments)],
+        )
+
+    def test_list_comments_of_missing_blog(self):
+        """Test listing the comments of a missing blog returns 404."""
+        blog = create_blog(author=self.user)
+
+        res = self.client.get(blog_comments_url(blog.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], [])
+
+        res = self.client.get(blog_comments_url(blog.id + 1))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_blog_comments_not_modified(self):
+        """Test an unchanged comment list is answered with 304."""
+        blog = create_blog(author=self.user)
+        comment = Comment.objects.create(
+            comment_text='This is a test comment.',
+            blog=blog,
+            author=self.user,
+        )
+        url = blog_comments_url(blog.id)
+        etag = self.client.get(url)['ETag']
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        CommentLike.objects.like(comment, self.user)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'][0]['likes_count'], 1)
+
+    def test_list_blog_comments_paginated(self):
+        """Test a blog's comments are split into cursor linked pages."""
+        blog = create_blog(author=self.user)
+        comments = [
+            Comment.objects.create(
+                comment_text='This is a test comment.',
+                blog=blog,
+                author=self.user,
+                likes_count=0
+            )
+            for _ in range(3)
+        ]
+
+        res = self.client.get(blog_comments_url(blog.id), {'page_size': 2})
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [comment['id'] for comment in res.data['results']],
+            [comments[0].id],
+        )
+        self.assertIsNone(res.data['next'])
+
+
 class AuthentiatedCommentAPITests(TestCase):
     """Authenticated tests for Comments API."""
 
@@ -70,6 +169,29 @@ class AuthentiatedCommentAPITests(TestCase):
     
         self.assertEqual(comment.comment_text, payload['comment_text'])
 
+    def test_comment_list_query_budget(self):
+        """Test listing comments runs a constant number of queries."""
+        blog = create_blog(author=self.user)
+        for _ in range(5):
+            Comment.objects.create(
+                comment_text='This is a test comment.',
+                blog=blog,
+                author=self.user,
+                likes_count=0
+            )
+
+        with self.assertNumQueries(CommentViewSet.query_budget['list']):
+            res = self.client.get(COMMENT_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 5)
+
+    def test_retrieve_non_numeric_id_not_found(self):
+        """Test retrieving a comment by an id that is not a number."""
+        res = self.client.get(detail_url('abc'))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_deleting_comment(self):
         """Test deleting a comment."""
         blog = create_blog(
@@ -115,8 +237,8 @@ class AuthentiatedCommentAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(comment.comment_text, payload['comment_text'])
 
-    def test_updating_comment_likes_count(self):
-        """Test updating comment likes count."""
+    def test_updating_comment_likes_count_ignored(self):
+        """Test the likes count can't be overwritten by clients."""
         blog = create_blog(
             author=self.user,
             title='This is test blog title',
@@ -136,7 +258,50 @@ class AuthentiatedCommentAPITests(TestCase):
         res = self.client.patch(url, payload)
         comment.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(comment.likes_count, int(payload['likes_count']))
+        self.assertEqual(comment.likes_count, 3)
+
+    def test_like_comment(self):
+        """Test liking a comment counts one like per user."""
+        blog = create_blog(author=self.user)
+        comment = Comment.objects.create(
+            comment_text='This is a test comment.',
+            blog=blog,
+            author=self.user,
+        )
+
+        url = like_url(comment.id)
+        res = self.client.post(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'liked': True, 'likes_count': 1})
+
+        res = self.client.post(url)
+        self.assertEqual(res.data, {'liked': True, 'likes_count': 1})
+        comment.refresh_from_db()
+        self.assertEqual(comment.likes_count, 1)
+        self.assertTrue(CommentLike.objects.filter(
+            comment=comment,
+            user=self.user,
+        ).exists())
+
+    def test_unlike_comment(self):
+        """Test unliking a comment removes the user's like once."""
+        blog = create_blog(author=self.user)
+        comment = Comment.objects.create(
+            comment_text='This is a test comment.',
+            blog=blog,
+            author=self.user,
+        )
+        other_user = create_user(email='user2@example.com')
+        CommentLike.objects.like(comment, other_user)
+        CommentLike.objects.like(comment, self.user)
+
+        url = like_url(comment.id)
+        res = self.client.delete(url)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'liked': False, 'likes_count': 1})
+
+        res = self.client.delete(url)
+        self.assertEqual(res.data, {'liked': False, 'likes_count': 1})
 
     def test_changing_comment_blog_result_raises_error(self):
         """Test updating comment's blog should result in error"""
@@ -169,6 +334,31 @@ class AuthentiatedCommentAPITests(TestCase):
         
 
 
+    def test_put_cannot_move_comment(self):
+        """Test a PUT keeps a comment and its count on its blog."""
+        blog1 = create_blog(author=self.user)
+        blog2 = create_blog(author=self.user)
+        comment = Comment.objects.create(
+            comment_text='This is a test comment.',
+            blog=blog1,
+            author=self.user,
+        )
+
+        res = self.client.put(detail_url(comment.id), {
+            'comment_text': 'Moved comment.',
+            'blog': blog2.id,
+            'author': self.user.id,
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        comment.refresh_from_db()
+        blog1.refresh_from_db()
+        blog2.refresh_from_db()
+        self.assertEqual(comment.comment_text, 'Moved comment.')
+        self.assertEqual(comment.blog, blog1)
+        self.assertEqual(blog1.comments_count, 1)
+        self.assertEqual(blog2.comments_count, 0)
+
     def test_changing_comment_author(self):
         """Test updating comment's author should raise error."""
         blog = create_blog(
@@ -191,4 +381,27 @@ class AuthentiatedCommentAPITests(TestCase):
         self.client.patch(url, {'author': user2.id})
 
         comment.refresh_from_db()
-        self.assertEqual(comment.author, self.user)
\ No newline at end of file
+        self.assertEqual(comment.author, self.user)
+
+    def test_export_comments_streams_all_rows(self):
+        """Test exporting comments streams every comment in chunks."""
+        blog = create_blog(author=self.user)
+        comments = [
+            Comment.objects.create(
+                comment_text=f'Comment {i}',
+                blog=blog,
+                author=self.user,
+            )
+            for i in range(5)
+        ]
+
+        with patch.object(CommentViewSet, 'export_chunk_size', 2):
+            with self.assertNumQueries(1):
+                res = self.client.get(reverse('blog:comment-export'))
+                data = json.loads(b''.join(res.streaming_content))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['id'], row['comment_text']) for row in data],
+            [(c.id, c.comment_text) for c in reversed(comments)],
+        )
@@ -0,0 +1,224 @@
+"""
+Tests for the feeds of followed authors.
+"""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog import feed
+from core.models import Blog, FeedEntry, Follow
+
+BLOG_URL = reverse('blog:blog-list')
+FEED_URL = reverse('blog:blog-feed')
+
+
+def follow_url(user_id):
+    """Create and return the URL following a user."""
+    return reverse('user:follow', args=[user_id])
+
+
+def create_user(email):
+    return get_user_model().objects.create_user(email=email, password='pw123')
+
+
+def create_blogs(author, count):
+    """Create and return blogs of an author, oldest first."""
+    return Blog.objects.bulk_create(
+        Blog(author=author, title=f'Blog {i}', excerpt='Excerpt.',
+             content='Content.')
+        for i in range(count)
+    )
+
+
+@override_settings(FEED_FAN_OUT_ASYNC=False)
+class FeedTests(TestCase):
+    """Test publishing to and reading feeds."""
+
+    def setUp(self):
+        self.user = create_user('reader@example.com')
+        self.author = create_user('author@example.com')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def publish(self, author, title='New blog'):
+        """Create a blog through the API and run its fan-out."""
+        client = APIClient()
+        client.force_authenticate(author)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = client.post(BLOG_URL, {
+                'title': title,
+                'excerpt': 'Excerpt.',
+                'content': 'Content.',
+            }, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        return Blog.objects.get(id=res.data['id'])
+
+    def test_feed_requires_authentication(self):
+        """Test anonymous users have no feed."""
+        res = APIClient().get(FEED_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_publish_fans_out_to_followers(self):
+        """Test a new blog is written to the feed of each follower."""
+        other = create_user('other@example.com')
+        Follow.objects.follow(self.user, self.author)
+
+        blog = self.publish(self.author)
+
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.user, blog=blog).exists()
+        )
+        self.assertFalse(FeedEntry.objects.filter(user=other).exists())
+        res = self.client.get(FEED_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([b['id'] for b in res.data['results']], [blog.id])
+
+    @override_settings(FEED_FAN_OUT_ASYNC=True)
+    def test_publish_fans_out_on_thread_pool(self):
+        """Test the fan-out runs on the thread pool after the commit."""
+        Follow.objects.follow(self.user, self.author)
+
+        with patch('blog.feed.get_executor') as get_executor:
+            blog = self.publish(self.author)
+
+        get_executor.return_value.submit.assert_called_once_with(
+            feed.run_logged,
+            feed.fan_out,
+            blog.id,
+            self.author.id,
+        )
+
+    def test_fan_out_batches(self):
+        """Test fan-out writes every follower in batches."""
+        followers = [create_user(f'f{i}@example.com') for i in range(5)]
+        for follower in followers:
+            Follow.objects.follow(follower, self.author)
+        blog, = create_blogs(self.author, 1)
+
+        with patch('blog.feed.FAN_OUT_BATCH_SIZE', 2):
+            written = feed.fan_out(blog.id, self.author.id)
+
+        self.assertEqual(written, 5)
+        self.assertEqual(FeedEntry.objects.filter(blog=blog).count(), 5)
+
+    @override_settings(FEED_HOT_AUTHOR_FOLLOWERS=2)
+    def test_hot_author_read_on_demand(self):
+        """Test posts of hot authors are read from blogs, not fanned out."""
+        Follow.objects.follow(self.user, self.author)
+        Follow.objects.follow(create_user('other@example.com'), self.author)
+        cold = create_user('cold@example.com')
+        Follow.objects.follow(self.user, cold)
+
+        hot_blog = self.publish(self.author, 'Hot')
+        cold_blog = self.publish(cold, 'Cold')
+
+        self.assertFalse(FeedEntry.objects.filter(blog=hot_blog).exists())
+        res = self.client.get(FEED_URL)
+        self.assertEqual(
+            [b['id'] for b in res.data['results']],
+            [cold_blog.id, hot_blog.id],
+        )
+
+    @override_settings(FEED_HOT_AUTHOR_FOLLOWERS=2)
+    def test_cooled_author_backfilled(self):
+        """Test posts of a hot author stay in feeds once no longer hot."""
+        other = create_user('other@example.com')
+        Follow.objects.follow(self.user, self.author)
+        Follow.objects.follow(other, self.author)
+        blog = self.publish(self.author)
+        self.assertFalse(FeedEntry.objects.filter(blog=blog).exists())
+
+        client = APIClient()
+        client.force_authenticate(other)
+        with self.captureOnCommitCallbacks(execute=True):
+            res = client.delete(follow_url(self.author.id))
+        self.assertEqual(res.data['followers_count'], 1)
+
+        self.assertTrue(
+            FeedEntry.objects.filter(user=self.user, blog=blog).exists()
+        )
+        res = self.client.get(FEED_URL)
+        self.assertEqual([b['id'] for b in res.data['results']], [blog.id])
+
+    @override_settings(FEED_HOT_AUTHOR_FOLLOWERS=1)
+    def test_queries_independent_of_hot_authors(self):
+        """Test following more hot authors adds no queries."""
+        Follow.objects.follow(self.user, self.author)
+        create_blogs(self.author, 3)
+        with CaptureQueriesContext(connection) as one:
+            self.client.get(FEED_URL)
+
+        for i in range(3):
+            author = create_user(f'hot{i}@example.com')
+            Follow.objects.follow(self.user, author)
+            create_blogs(author, 3)
+        with CaptureQueriesContext(connection) as many:
+            res = self.client.get(FEED_URL)
+
+        self.assertEqual(len(res.data['results']), 12)
+        self.assertEqual(len(many), len(one))
+
+    def test_unfollow_removes_posts(self):
+        """Test unfollowing drops the author's posts from the feed."""
+        Follow.objects.follow(self.user, self.author)
+        self.publish(self.author)
+
+        Follow.objects.unfollow(self.user, self.author)
+
+        self.assertFalse(FeedEntry.objects.filter(user=self.user).exists())
+        self.assertEqual(self.client.get(FEED_URL).data['results'], [])
+
+    def test_feed_pages(self):
+        """Test the feed is paged newest first with a cursor."""
+        Follow.objects.follow(self.user, self.author)
+        blogs = create_blogs(self.author, 5)
+        for blog in blogs:
+            feed.fan_out(blog.id, self.author.id)
+        expected = [blog.id for blog in reversed(blogs)]
+
+        ids = []
+        url = f'{FEED_URL}?page_size=2'
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
+            self.assertIsNone(res.data['previous'])
+            ids.extend(b['id'] for b in res.data['results'])
+            url = res.data['next']
+
+        self.assertEqual(ids, expected)
+
+    def test_invalid_cursor(self):
+        """Test a cursor that is not a blog id is rejected."""
+        res = self.client.get(FEED_URL, {'cursor': 'bogus'})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(FEED_HOT_AUTHOR_FOLLOWERS=2)
+    def test_queries_independent_of_depth(self):
+        """Test a deep page runs the same queries as the first one."""
+        cold = create_user('cold@example.com')
+        Follow.objects.follow(self.user, cold)
+        Follow.objects.follow(self.user, self.author)
+        Follow.objects.follow(cold, self.author)
+        create_blogs(self.author, 30)
+        for blog in create_blogs(cold, 30):
+            FeedEntry.objects.create(user=self.user, blog=blog)
+
+        with CaptureQueriesContext(connection) as first:
+            res = self.client.get(FEED_URL, {'page_size': 5})
+        for _ in range(5):
+            res = self.client.get(res.data['next'])
+        with CaptureQueriesContext(connection) as deep:
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(len(res.data['results']), 5)
+        self.assertEqual(len(deep), len(first))
@@ -0,0 +1,146 @@
+"""
+Tests for full-text search over blogs.
+"""
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models.signals import post_delete, post_save
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import Blog
+
+BLOG_URL = reverse('blog:blog-list')
+
+
+def create_user(**params):
+    """Create and return a new user"""
+    return get_user_model().objects.create_user(**params)
+
+
+def create_blog(author, **params):
+    """Create and return sample blog."""
+    defaults = {
+        'title': 'Sample blog title',
+        'excerpt': 'Sample blog excerpt.',
+        'content': 'This content is a Sample blog content.'
+    }
+    defaults.update(**params)
+
+    return Blog.objects.create(author=author, **defaults)
+
+
+class BlogSearchAPITests(TestCase):
+    """Test searching the blog list."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(email='user@example.com', password='test123')
+
+    def search(self, term, **params):
+        """Search blogs and return the ids of the results."""
+        res = self.client.get(BLOG_URL, {'search': term, **params})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [blog['id'] for blog in res.data['results']]
+
+    def test_search_matches_words(self):
+        """Test only blogs containing every word are returned."""
+        match = create_blog(self.user, content='Brewing coffee at home.')
+        create_blog(self.user, content='Brewing tea at home.')
+
+        self.assertEqual(self.search('coffee brewing'), [match.id])
+
+    def test_search_stems_words(self):
+        """Test search matches other forms of a word."""
+        blog = create_blog(self.user, content='Notes on running shoes.')
+
+        self.assertEqual(self.search('runs'), [blog.id])
+
+    def test_search_ranks_title_matches_first(self):
+        """Test title matches rank above content matches."""
+        in_title = create_blog(self.user, title='Sourdough basics')
+        in_content = create_blog(
+            self.user,
+            content='A loaf of sourdough bread.',
+        )
+
+        self.assertEqual(
+            self.search('sourdough'),
+            [in_title.id, in_content.id],
+        )
+
+    def test_search_ignores_query_syntax(self):
+        """Test operators in the search terms are treated as words."""
+        blog = create_blog(self.user, title='Cats AND dogs')
+
+        self.assertEqual(self.search('"cats" NOT -dogs*'), [])
+        self.assertEqual(self.search('cats) OR (dogs'), [])
+        self.assertEqual(self.search('dogs: "cats'), [blog.id])
+        self.assertEqual(self.search('***'), [])
+
+    def test_search_follows_updates_and_deletes(self):
+        """Test the index follows changes to blogs."""
+        blog = create_blog(self.user, title='Old title')
+
+        blog.title = 'Fresh title'
+        blog.save()
+
+        self.assertEqual(self.search('old'), [])
+        self.assertEqual(self.search('fresh'), [blog.id])
+
+        blog.delete()
+
+        self.assertEqual(self.search('fresh'), [])
+
+    def test_index_follows_database_alias(self):
+        """Test the index is kept in the database the blog is saved to."""
+        blog = create_blog(self.user)
+
+        with patch('blog.signals.index_blog') as index_blog:
+            post_save.send(Blog, instance=blog, created=False, using='other')
+        with patch('blog.signals.unindex_blog') as unindex_blog:
+            post_delete.send(Blog, instance=blog, using='other')
+
+        index_blog.assert_called_once_with(blog, 'other')
+        unindex_blog.assert_called_once_with(blog.id, 'other')
+
+    def test_search_results_paginated_by_rank(self):
+        """Test search results are paged in rank order."""
+        best = create_blog(self.user, title='Garden', content='Garden')
+        good = create_blog(self.user, title='Garden')
+        fair = create_blog(self.user, content='Garden')
+
+        res = self.client.get(BLOG_URL, {'search': 'garden', 'page_size': 2})
+
+        self.assertEqual(
+            [blog['id'] for blog in res.data['results']],
+            [best.id, good.id],
+        )
+
+        res = self.client.get(res.data['next'])
+
+        self.assertEqual(
+            [blog['id'] for blog in res.data['results']],
+            [fair.id],
+        )
+        self.assertIsNone(res.data['next'])
+
+    def test_rebuild_search_index(self):
+        """Test the rebuild command restores a stale index."""
+        blog = create_blog(self.user, title='Stale')
+        Blog.objects.filter(id=blog.id).update(title='Rebuilt')
+        self.assertEqual(self.search('rebuilt'), [])
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn('Indexed 1 blog(s).', out.getvalue())
+        cache.clear()
+        self.assertEqual(self.search('rebuilt'), [blog.id])
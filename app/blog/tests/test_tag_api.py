@@ -10,10 +10,12 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import (
+    Blog,
     Tag
 )
 
 from blog.serializers import TagSerializer
+from blog.views import TagViewSet
 
 
 TAGS_URL = reverse('blog:tag-list')
@@ -59,4 +61,35 @@ class PrivateTagsAPITests(TestCase):
         tags = Tag.objects.all().order_by('-name')
         serializer = TagSerializer(tags, many=True)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_create_duplicate_tag_error(self):
+        """Test creating a tag differing only by case returns an error."""
+        Tag.objects.create(name='Latest')
+
+        res = self.client.post(TAGS_URL, {'name': 'latest'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Tag.objects.count(), 1)
+
+    def test_retrieve_tags_with_counts(self):
+        """Test listing tags with the number of blogs using them."""
+        tag = Tag.objects.create(name='Latest')
+        Tag.objects.create(name='Technical')
+        for _ in range(2):
+            blog = Blog.objects.create(
+                author=self.user,
+                title='Sample blog title',
+                excerpt='Sample blog excerpt.',
+                content='Sample blog content.',
+            )
+            blog.tags.add(tag)
+
+        with self.assertNumQueries(TagViewSet.query_budget['list']):
+            res = self.client.get(TAGS_URL, {'with_counts': 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(t['name'], t['blogs_count']) for t in res.data['results']],
+            [('Technical', 0), ('Latest', 2)],
+        )
@@ -6,12 +6,17 @@ from django.urls import (
     include
 )
 
-from rest_framework.routers import DefaultRouter
+from rest_framework_extensions.routers import ExtendedDefaultRouter
 
 from blog import views
 
-router = DefaultRouter()
-router.register('blogs', views.BlogViewSet, basename='blog')
+router = ExtendedDefaultRouter()
+router.register('blogs', views.BlogViewSet, basename='blog').register(
+    'comments',
+    views.BlogCommentViewSet,
+    basename='blog-comment',
+    parents_query_lookups=['blog'],
+)
 router.register('tags', views.TagViewSet, basename='tag')
 router.register('comments', views.CommentViewSet, basename='comment')
 
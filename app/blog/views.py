@@ -1,7 +1,13 @@
 """
 Views for the blog APIs.
 """
+from django.db.models import Max, Prefetch
 from django.shortcuts import render
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    extend_schema,
+    extend_schema_view,
+)
 from rest_framework import generics, authentication, permissions
 from rest_framework import (
     viewsets,
@@ -9,20 +15,42 @@ from rest_framework import (
     status,
 )
 
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .permissions import AuthenticatedOrListOnly, IsOwnerOrReadOnly
 from rest_framework.views import APIView
+from rest_framework_extensions.mixins import NestedViewSetMixin
 
 from core.models import (
     Blog,
     Tag,
     Comment,
+    CommentLike,
 )
+from user.authentication import CachedTokenAuthentication
 from blog import serializers
+from blog.cache import CachedResponseMixin
+from blog.conditional import ConditionalGetMixin, ConditionalListMixin
+from blog.feed import feed_blog_ids, publish
+from blog.filters import BlogSearchFilter, BlogTagFilter
+from blog.streaming import StreamingExportMixin
+from blog.pagination import (
+    BlogCursorPagination,
+    FeedCursorPagination,
+    IdCursorPagination,
+    TagCursorPagination,
+)
 
 
+@extend_schema_view(export=extend_schema(
+    responses=serializers.BlogSerializer(many=True),
+))
 class BlogViewSet(
+        CachedResponseMixin,
+        ConditionalGetMixin,
+        StreamingExportMixin,
         viewsets.ModelViewSet,
         mixins.UpdateModelMixin,
         mixins.DestroyModelMixin,
@@ -30,37 +58,125 @@ class BlogViewSet(
     ):
     """Views to provide api for blog API"""
     serializer_class = serializers.BlogSerializer
-    queryset = Blog.objects.all().order_by('-id').distinct()
-    authentication_classes = [TokenAuthentication]
+    queryset = Blog.objects.all().order_by('-id')
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [AuthenticatedOrListOnly, IsOwnerOrReadOnly]
+    filter_backends = [BlogSearchFilter, BlogTagFilter]
+    pagination_class = BlogCursorPagination
+    # Upper bound of queries per action, validators included, independent
+    # of the number of rows.
+    query_budget = {'list': 4, 'retrieve': 4}
+    read_from_replica = True
+
+    def get_serializer_class(self):
+        """Return the slim serializer for lists."""
+        if self.action in ('list', 'feed'):
+            return serializers.BlogListSerializer
+
+        return self.serializer_class
+
+    def get_queryset(self):
+        """Retrieve blogs with only the columns and relations rendered."""
+        fields = self.get_serializer().fields
+        queryset = self.queryset.select_related('author').defer(*(
+            name for name in ('excerpt', 'content') if name not in fields
+        ))
+        if 'tags' in fields:
+            queryset = queryset.prefetch_related('tags')
+        if 'comments' in fields:
+            queryset = queryset.prefetch_related(Prefetch(
+                'comments',
+                queryset=Comment.objects.order_by('-id')[
+                    :serializers.COMMENTS_PREVIEW_SIZE
+                ],
+                to_attr='recent_comments',
+            ))
+
+        return queryset
+
+    def get_validator_annotations(self):
+        """Cover the embedded comments when they are rendered."""
+        if 'comments' not in self.get_serializer().fields:
+            return {}
+
+        return {'comments_updated_at': Max('comments__updated_at')}
 
     def perform_create(self, serializer):
-        """Create a new blog."""
-        serializer.save(author=self.request.user)
+        """Create a new blog and add it to the feeds of followers."""
+        blog = serializer.save(author=self.request.user)
+        publish(blog)
+
+    @extend_schema(responses=serializers.BlogListSerializer(many=True))
+    @action(
+        detail=False,
+        permission_classes=[IsAuthenticated],
+        pagination_class=FeedCursorPagination,
+        filter_backends=[],
+    )
+    def feed(self, request):
+        """List the newest posts of the authors the user follows."""
+        paginator = self.paginator
+        ids = paginator.paginate_feed(
+            lambda before, limit: feed_blog_ids(
+                request.user,
+                before,
+                limit,
+            ),
+            request,
+        )
+        blogs = self.get_queryset().filter(id__in=ids)
+        serializer = self.get_serializer(blogs, many=True)
 
+        return paginator.get_paginated_response(serializer.data)
 
+
+@extend_schema_view(list=extend_schema(
+    parameters=[OpenApiParameter(
+        'with_counts',
+        bool,
+        description='Include the number of blogs using each tag.',
+    )],
+    responses=serializers.TagCountSerializer(many=True),
+))
 class TagViewSet(viewsets.ModelViewSet):
     """Manage tags in the database."""
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     serializer_class = serializers.TagSerializer
-    queryset = Tag.objects.all().order_by('-name').distinct()
+    queryset = Tag.objects.all().order_by('-name')
+    pagination_class = TagCursorPagination
+    query_budget = {'list': 1, 'retrieve': 1}
+    read_from_replica = True
+
+    def get_serializer_class(self):
+        """Return the serializer with blog counts when asked for."""
+        with_counts = self.request.query_params.get('with_counts', '')
+        if self.action == 'list' and with_counts.lower() in ('1', 'true'):
+            return serializers.TagCountSerializer
 
+        return self.serializer_class
 
+
+@extend_schema_view(export=extend_schema(
+    responses=serializers.CommentPostSerializer(many=True),
+))
 class CommentViewSet(
+        ConditionalGetMixin,
+        StreamingExportMixin,
         viewsets.ModelViewSet,
         mixins.UpdateModelMixin,
         mixins.DestroyModelMixin,
         mixins.ListModelMixin
     ):
     """Manage comments in the database."""
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_serializer_class(self):
+        """Keep the blog and author of existing comments read-only."""
         serializer_class = self.serializer_class
-        if self.request.method == 'PATCH':
+        if self.action in ('update', 'partial_update'):
             serializer_class = serializers.CommentPutSerializer
         else:
             serializer_class = serializers.CommentPostSerializer
@@ -68,8 +184,73 @@ class CommentViewSet(
         return serializer_class
 
     queryset = Comment.objects.all().order_by('-id')
+    pagination_class = IdCursorPagination
+    query_budget = {'list': 2, 'retrieve': 2}
+    read_from_replica = True
 
-    
     def perform_create(self, serializer):
         """Create a new comment."""
         serializer.save(author=self.request.user)
+
+    @extend_schema(
+        request=None,
+        responses=serializers.CommentLikeSerializer,
+    )
+    @action(methods=['POST', 'DELETE'], detail=True)
+    def like(self, request, pk=None):
+        """Like or unlike a comment, at most once per user."""
+        comment = self.get_object()
+        if request.method == 'POST':
+            CommentLike.objects.like(comment, request.user)
+        else:
+            CommentLike.objects.unlike(comment, request.user)
+        comment.refresh_from_db(fields=['likes_count'])
+        serializer = serializers.CommentLikeSerializer({
+            'liked': request.method == 'POST',
+            'likes_count': comment.likes_count,
+        })
+
+        return Response(serializer.data)
+
+
+@extend_schema_view(list=extend_schema(parameters=[
+    OpenApiParameter('parent_lookup_blog', int, OpenApiParameter.PATH),
+]))
+class BlogCommentViewSet(
+    ConditionalListMixin,
+    NestedViewSetMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet,
+):
+    """List the comments of a blog, newest first."""
+    serializer_class = serializers.CommentPostSerializer
+    queryset = Comment.objects.all().order_by('-id')
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [AuthenticatedOrListOnly]
+    pagination_class = IdCursorPagination
+    query_budget = {'list': 2}
+    read_from_replica = True
+
+    def get_blog_queryset(self):
+        """Return the blog whose comments are listed."""
+        return Blog.objects.filter(id=self.get_parents_query_dict()['blog'])
+
+    def get_validator_rows(self):
+        """Return the validator rows, 404 when the blog does not exist.
+
+        The blog is only looked up when there are no comments to show,
+        so pages with comments stay within the query budget.
+        """
+        rows, links = super().get_validator_rows()
+        if not rows and not self.get_blog_queryset().exists():
+            raise NotFound()
+
+        return rows, links
+
+    async def aget_validator_rows(self):
+        """Return the validator rows, 404 when the blog does not exist."""
+        rows, links = await super().aget_validator_rows()
+        if not rows and not await self.get_blog_queryset().aexists():
+            raise NotFound()
+
+        return rows, links
@@ -0,0 +1,295 @@
+"""
+Endpoint benchmarks over seeded datasets.
+
+Every route of the blog and user APIs is driven through the Django test
+client against a dedicated database holding a dataset of a given size.
+Results are plain dicts so runs can be written out and compared.
+"""
+import random
+import statistics
+import time
+
+from django.db import connection
+from django.urls import reverse
+from django.urls.resolvers import URLResolver
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from blog import urls as blog_urls
+from core import seeding
+from core.models import Blog, Comment, Tag, User
+from user import urls as user_urls
+
+# Number of blogs in each dataset. Comments match blogs, users and tags
+# are a hundredth of them.
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+
+
+def seed_dataset(count, seed=0, log=None):
+    """Fill an empty database with count blogs and comments."""
+    return seeding.seed_data(
+        users=max(10, count // 100),
+        blogs=count,
+        comments=count,
+        seed=seed,
+        log=log,
+    )
+
+
+def route_names(patterns, namespace):
+    """Return the names of the routes in a list of URL patterns."""
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns, namespace)
+        elif pattern.name:
+            names.add(f'{namespace}:{pattern.name}')
+
+    return names
+
+
+def api_routes():
+    """Return the names of every blog and user API route."""
+    return (
+        route_names(blog_urls.urlpatterns, blog_urls.app_name)
+        | route_names(user_urls.urlpatterns, user_urls.app_name)
+    )
+
+
+class Scenario:
+    """A request to one route, repeated with varying targets."""
+
+    def __init__(self, name, route, method='get', args=None, query=None,
+                 data=None, requests=None):
+        self.name = name
+        self.route = route
+        self.method = method
+        self.args = args
+        self.query = query
+        self.data = data
+        self.requests = requests
+
+    def request(self, context, i):
+        """Return the path and data of the i-th request."""
+        args = self.args(context, i) if self.args else []
+        path = reverse(self.route, args=args)
+        if self.method == 'get':
+            return path, self.query
+        return path, self.data(context, i) if self.data else None
+
+
+def random_id(model):
+    """Return a function picking a random existing row id."""
+    return lambda context, i: [context.rng.choice(context.ids[model])]
+
+
+def own_id(kind):
+    """Return a function picking the i-th row created for the benchmark."""
+    return lambda context, i: [context.own[kind][i]]
+
+
+SCENARIOS = [
+    Scenario('api-root', 'blog:api-root'),
+    Scenario('blog-list', 'blog:blog-list'),
+    Scenario(
+        'blog-list-search',
+        'blog:blog-list',
+        query={'search': 'cache latency'},
+    ),
+    Scenario(
+        'blog-list-tags',
+        'blog:blog-list',
+        query={
+            'tags': ','.join(seeding.TOPICS[:2]),
+            'tags_match': 'all',
+        },
+    ),
+    Scenario(
+        'blog-create',
+        'blog:blog-list',
+        method='post',
+        data=lambda context, i: {
+            'title': f'Benchmark blog {i}',
+            'excerpt': 'Benchmark excerpt.',
+            'content': 'Benchmark content.',
+            'tags': [
+                {'name': seeding.TOPICS[0]},
+                {'name': f'benchmark-{i}'},
+            ],
+        },
+    ),
+    Scenario('blog-detail', 'blog:blog-detail', args=random_id(Blog)),
+    Scenario(
+        'blog-update',
+        'blog:blog-detail',
+        method='patch',
+        args=own_id('blog'),
+        data=lambda context, i: {'title': f'Updated blog {i}'},
+    ),
+    Scenario('blog-delete', 'blog:blog-detail', method='delete',
+             args=own_id('blog-delete')),
+    Scenario('blog-export', 'blog:blog-export', requests=3),
+    Scenario('blog-feed', 'blog:blog-feed'),
+    Scenario('blog-comments', 'blog:blog-comment-list', args=random_id(Blog)),
+    Scenario('tag-list', 'blog:tag-list'),
+    Scenario('tag-list-counts', 'blog:tag-list', query={'with_counts': 1}),
+    Scenario(
+        'tag-create',
+        'blog:tag-list',
+        method='post',
+        data=lambda context, i: {'name': f'new-tag-{context.run}-{i}'},
+    ),
+    Scenario('tag-detail', 'blog:tag-detail', args=random_id(Tag)),
+    Scenario('comment-list', 'blog:comment-list'),
+    Scenario(
+        'comment-create',
+        'blog:comment-list',
+        method='post',
+        data=lambda context, i: {
+            'comment_text': f'Benchmark comment {i}',
+            'author': context.user.id,
+            'blog': context.rng.choice(context.ids[Blog]),
+        },
+    ),
+    Scenario('comment-detail', 'blog:comment-detail',
+             args=random_id(Comment)),
+    Scenario(
+        'comment-update',
+        'blog:comment-detail',
+        method='patch',
+        args=own_id('comment'),
+        data=lambda context, i: {'comment_text': f'Updated comment {i}'},
+    ),
+    Scenario('comment-like', 'blog:comment-like', method='post',
+             args=random_id(Comment)),
+    Scenario('comment-export', 'blog:comment-export', requests=3),
+    Scenario(
+        'user-create',
+        'user:create',
+        method='post',
+        data=lambda context, i: {
+            'email': f'new-{context.run}-{i}@example.com',
+            'password': seeding.PASSWORD,
+            'name': 'New user',
+        },
+    ),
+    Scenario(
+        'user-token',
+        'user:token',
+        method='post',
+        data=lambda context, i: {
+            'email': context.user.email,
+            'password': seeding.PASSWORD,
+        },
+    ),
+    Scenario('user-me', 'user:me'),
+    Scenario('user-follow', 'user:follow', method='post',
+             args=random_id(User)),
+]
+
+
+class Context:
+    """State shared by the scenarios of one run."""
+
+    def __init__(self, seed, requests):
+        self.rng = random.Random(seed)
+        self.run = time.time_ns()
+        self.user = User.objects.order_by('id').first()
+        self.token = Token.objects.get_or_create(user=self.user)[0]
+        self.ids = {
+            model: list(model.objects.values_list('id', flat=True))
+            for model in (Blog, Comment, Tag)
+        }
+        # Users cannot follow themselves.
+        self.ids[User] = list(
+            User.objects.exclude(id=self.user.id).values_list('id', flat=True)
+        )
+        blog_ids = [blog.id for blog in Blog.objects.bulk_create(
+            Blog(author=self.user, title='Own blog', excerpt='Excerpt.',
+                 content='Content.')
+            for _ in range(2 * requests)
+        )]
+        comment_ids = [comment.id for comment in Comment.objects.bulk_create(
+            Comment(author=self.user, blog_id=blog_ids[0], comment_text='Own')
+            for _ in range(requests)
+        )]
+        # Rows the write scenarios may change or delete.
+        self.own = {
+            'blog': blog_ids[:requests],
+            'blog-delete': blog_ids[requests:],
+            'comment': comment_ids,
+        }
+
+
+def percentile(latencies, fraction):
+    """Return the latency below which the given fraction of requests fall."""
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_scenario(scenario, context, client, requests):
+    """Time a scenario and return its results."""
+    requests = scenario.requests or requests
+    queries = []
+
+    def count_queries(execute, *args):
+        queries[-1] += 1
+        return execute(*args)
+
+    latencies = []
+    statuses = set()
+    method = getattr(client, scenario.method)
+    with connection.execute_wrapper(count_queries):
+        for i in range(requests):
+            path, data = scenario.request(context, i)
+            queries.append(0)
+            start = time.perf_counter()
+            response = method(path, data, format='json')
+            if getattr(response, 'streaming', False):
+                for _ in response.streaming_content:
+                    pass
+            latencies.append(time.perf_counter() - start)
+            statuses.add(response.status_code)
+
+    return {
+        'route': scenario.route,
+        'method': scenario.method.upper(),
+        'requests': requests,
+        'statuses': sorted(statuses),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'throughput_rps': round(requests / sum(latencies), 1),
+        'queries_mean': round(statistics.mean(queries), 2),
+        'queries_max': max(queries),
+    }
+
+
+def run_benchmark(requests, seed, scenarios=SCENARIOS):
+    """Run the scenarios against the current database."""
+    context = Context(seed, requests)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {context.token.key}')
+
+    return {
+        scenario.name: run_scenario(scenario, context, client, requests)
+        for scenario in scenarios
+    }
+
+
+def compare(baseline, results):
+    """Return the relative change of each metric against a baseline run."""
+    changes = {}
+    for name, metrics in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        changes[name] = {
+            metric: round((metrics[metric] - before[metric])
+                          / before[metric] * 100, 1)
+            for metric in ('p50_ms', 'p99_ms', 'throughput_rps',
+                           'queries_mean')
+            if before.get(metric)
+        }
+
+    return changes
@@ -0,0 +1,167 @@
+"""
+Row counts that do not scan large tables.
+
+COUNT(*) reads every matching row on both PostgreSQL and SQLite. The
+planner keeps estimates that are good enough for pagination: the table
+row count in reltuples on PostgreSQL and sqlite_stat1 on SQLite, kept
+current by autovacuum and ANALYZE, and on PostgreSQL the estimated rows
+of any query. estimated_count() returns the estimate when it is at least
+ESTIMATED_COUNT_THRESHOLD and an exact count otherwise, so small results
+stay exact. Counts at or above the threshold are cached per query for
+COUNT_CACHE_TIMEOUT seconds.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import (
+    EmptyPage,
+    Page,
+    PageNotAnInteger,
+    Paginator,
+)
+from django.db import DatabaseError, connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+
+def estimated_row_count(model, using='default'):
+    """Return the planner's row count of a model's table, or None."""
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                    [connection.ops.quote_name(table)],
+                )
+                row = cursor.fetchone()
+                # Negative until the table is first analyzed.
+                if row is None or row[0] < 0:
+                    return None
+                return int(row[0])
+            if connection.vendor == 'sqlite':
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s',
+                    [table],
+                )
+                # Each row starts with the table's row count when analyzed.
+                counts = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+                return max(counts) if counts else None
+    except DatabaseError:
+        # sqlite_stat1 only exists once ANALYZE has run.
+        return None
+
+    return None
+
+
+def is_unfiltered(queryset):
+    """Return whether a queryset selects every row of its table."""
+    query = queryset.query
+    return not (
+        query.where
+        or query.distinct
+        or query.combinator
+        or query.is_sliced
+        or query.group_by is not None
+    )
+
+
+def planner_estimate(queryset):
+    """Return the planner's row count estimate of a queryset, or None."""
+    if is_unfiltered(queryset):
+        return estimated_row_count(queryset.model, queryset.db)
+    if connections[queryset.db].vendor == 'postgresql':
+        plan = json.loads(queryset.explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    return None
+
+
+def count_cache_key(queryset):
+    """Return the cache key of a queryset's count."""
+    sql, params = queryset.query.sql_with_params()
+    signature = repr((queryset.db, sql, params)).encode()
+    digest = hashlib.md5(signature, usedforsecurity=False).hexdigest()
+
+    return f'count:{digest}'
+
+
+def estimated_count(queryset, threshold=None):
+    """Return the number of rows of a queryset, estimated when large."""
+    if threshold is None:
+        threshold = settings.ESTIMATED_COUNT_THRESHOLD
+    if queryset.query.is_empty():
+        return 0
+    queryset = queryset.order_by()
+    key = count_cache_key(queryset)
+    count = cache.get(key)
+    if count is not None:
+        return count
+
+    count = planner_estimate(queryset)
+    if count is None or count < threshold:
+        count = queryset.count()
+    if count >= threshold:
+        cache.set(key, count, settings.COUNT_CACHE_TIMEOUT)
+
+    return count
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator counting large querysets from planner estimates."""
+    count_threshold = None
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+
+        return estimated_count(self.object_list, self.count_threshold)
+
+    def validate_number(self, number):
+        """Accept any page number, as rows may go past an estimate."""
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+
+        return number
+
+    def page(self, number):
+        """Return a page, found from its rows rather than the count.
+
+        One more row than the page holds is fetched to tell whether
+        another page follows.
+        """
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        last = self.per_page + self.orphans
+        rows = list(self.object_list[bottom:bottom + last + 1])
+        if not rows and number > 1:
+            raise EmptyPage(_('That page contains no results'))
+        has_next = len(rows) > last
+        if has_next:
+            rows = rows[:self.per_page]
+
+        return EstimatedPage(rows, number, self, has_next)
+
+
+class EstimatedPage(Page):
+    """Page of an EstimatedCountPaginator, not bounded by its count."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1
@@ -0,0 +1,138 @@
+"""
+Django command benchmarking every API route over a seeded dataset.
+"""
+import json
+import platform
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from core import benchmark
+from core.models import Blog
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the API."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--size',
+            choices=list(benchmark.SIZES),
+            default='1k',
+            help='Dataset size, in blogs.',
+        )
+        parser.add_argument('--requests', type=int, default=100)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            dest='scenarios',
+            help='Only run the named scenario, may be repeated.',
+        )
+        parser.add_argument(
+            '--keepdb',
+            action='store_true',
+            help='Keep the benchmark database to reuse its dataset.',
+        )
+        parser.add_argument(
+            '--output',
+            help='JSON file to write, benchmark-<size>.json by default.',
+        )
+        parser.add_argument(
+            '--compare',
+            help='JSON file of an earlier run to compare against.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        size = options['size']
+        scenarios = benchmark.SCENARIOS
+        if options['scenarios']:
+            names = set(options['scenarios'])
+            scenarios = [s for s in scenarios if s.name in names]
+            unknown = names - {s.name for s in scenarios}
+            if unknown:
+                raise CommandError(
+                    f"Unknown scenario {', '.join(sorted(unknown))}."
+                )
+        uncovered = benchmark.api_routes() - {s.route for s in scenarios}
+        if uncovered and not options['scenarios']:
+            self.stdout.write(self.style.WARNING(
+                f"Routes without a scenario: {', '.join(sorted(uncovered))}"
+            ))
+
+        # The dataset lives in its own database, named after its size.
+        connection.settings_dict['TEST']['NAME'] = (
+            f'benchmark_{size}.sqlite3' if connection.vendor == 'sqlite'
+            else f'benchmark_{size}'
+        )
+        setup_test_environment()
+        old_config = setup_databases(
+            verbosity=0,
+            interactive=False,
+            keepdb=options['keepdb'],
+            aliases={connection.alias},
+        )
+        try:
+            if not Blog.objects.exists():
+                self.stdout.write(f'Seeding {size} dataset...')
+                start = time.perf_counter()
+                benchmark.seed_dataset(benchmark.SIZES[size])
+                self.stdout.write(
+                    f'Seeded in {time.perf_counter() - start:.1f}s.'
+                )
+            results = benchmark.run_benchmark(
+                options['requests'],
+                options['seed'],
+                scenarios,
+            )
+        finally:
+            teardown_databases(
+                old_config,
+                verbosity=0,
+                keepdb=options['keepdb'],
+            )
+            teardown_test_environment()
+
+        for name, metrics in results.items():
+            self.stdout.write(
+                f"{name:<18} p50 {metrics['p50_ms']:>9.2f} ms  "
+                f"p99 {metrics['p99_ms']:>9.2f} ms  "
+                f"{metrics['throughput_rps']:>8.1f} req/s  "
+                f"{metrics['queries_mean']:>6.2f} queries  "
+                f"{metrics['statuses']}"
+            )
+
+        report = {
+            'size': size,
+            'requests': options['requests'],
+            'seed': options['seed'],
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'results': results,
+        }
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                report['changes_pct'] = benchmark.compare(
+                    json.load(baseline)['results'],
+                    results,
+                )
+            for name, changes in report['changes_pct'].items():
+                self.stdout.write(f'{name:<18} ' + '  '.join(
+                    f'{metric} {change:+.1f}%'
+                    for metric, change in changes.items()
+                ))
+
+        output = options['output'] or f'benchmark-{size}.json'
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {output}.'))
@@ -0,0 +1,84 @@
+"""
+Django command measuring the middleware skipped on API paths.
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+
+DEFAULT_PATHS = ['/api/blog/blogs/']
+
+
+def time_requests(client, paths, requests):
+    """Return the latency of each request, in seconds."""
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        response = client.get(paths[i % len(paths)])
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.status_code
+
+    return latencies
+
+
+class Command(BaseCommand):
+    """Django command to benchmark the lean API middleware stack."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            help='Path to request, may be repeated. '
+                 'Defaults to the blog list.',
+        )
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument(
+            '--token',
+            help='Token to authenticate the requests with.',
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=5,
+            help='Alternate between the stacks this many times.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        paths = options['paths'] or DEFAULT_PATHS
+        headers = {}
+        if options['token']:
+            headers['HTTP_AUTHORIZATION'] = f"Token {options['token']}"
+        client = Client(HTTP_HOST='localhost', **headers)
+        # Warm up caches and connections before measuring.
+        time_requests(client, paths, len(paths) * 2)
+
+        latencies = {'full': [], 'lean': []}
+        for _ in range(options['rounds']):
+            with override_settings(API_PATH_PREFIXES=[]):
+                latencies['full'] += time_requests(
+                    client,
+                    paths,
+                    options['requests'],
+                )
+            latencies['lean'] += time_requests(
+                client,
+                paths,
+                options['requests'],
+            )
+
+        medians = {}
+        for name, values in latencies.items():
+            medians[name] = statistics.median(values) * 1_000_000
+            self.stdout.write(
+                f'{name}: {len(values)} requests, '
+                f'p50 {medians[name]:.0f} us, '
+                f'mean {statistics.mean(values) * 1_000_000:.0f} us'
+            )
+        saved = medians['full'] - medians['lean']
+        self.stdout.write(self.style.SUCCESS(
+            f'Skipping the middleware saves {saved:.0f} us per request '
+            f"({saved / medians['full'] * 100:.1f}%)."
+        ))
@@ -0,0 +1,38 @@
+"""
+Django command to store the OpenAPI schema served by the API.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.schema import generate_schema, read_schema, schema_hash
+
+
+class Command(BaseCommand):
+    """Django command to build the OpenAPI schema."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Fail if the stored schema does not match the code.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        path = settings.OPENAPI_SCHEMA_PATH
+        content = generate_schema()
+        digest = schema_hash(content)
+
+        if options['check']:
+            if read_schema() != content:
+                raise CommandError(
+                    f'Schema {path} is stale, run build_schema.'
+                )
+            self.stdout.write(self.style.SUCCESS(
+                f'Schema {path} is current ({digest}).'
+            ))
+            return
+
+        with open(path, 'wb') as file:
+            file.write(content)
+        self.stdout.write(self.style.SUCCESS(f'Wrote {path} ({digest}).'))
@@ -0,0 +1,18 @@
+"""
+Django command to merge tags whose names differ only by case.
+"""
+from django.core.management.base import BaseCommand
+
+from core.models import Tag
+
+
+class Command(BaseCommand):
+    """Django command to merge duplicate tags."""
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        removed = Tag.objects.merge_duplicates()
+        Tag.objects.refresh_blogs_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f'Merged {removed} duplicate tag(s).')
+        )
@@ -0,0 +1,69 @@
+"""
+Django command to fill the database with synthetic data.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import seeding
+
+
+class Command(BaseCommand):
+    """Django command to seed the database."""
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1_000)
+        parser.add_argument('--blogs', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=100_000)
+        parser.add_argument(
+            '--tags',
+            type=int,
+            help='Defaults to a hundredth of the blogs, at least 10.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='The same seed always produces the same data.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=seeding.BATCH_SIZE,
+            help='Rows inserted per query.',
+        )
+        parser.add_argument(
+            '--no-search-index',
+            action='store_false',
+            dest='search_index',
+            help='Skip rebuilding the search index.',
+        )
+
+    def handle(self, *args, **options):
+        """Entrypoint for command."""
+        counts = [options[name] for name in ('users', 'blogs', 'comments')]
+        if min(counts) < 0 or (options['tags'] or 0) < 0:
+            raise CommandError('Counts cannot be negative.')
+        if options['batch_size'] < 1:
+            raise CommandError('The batch size must be positive.')
+
+        start = time.perf_counter()
+        try:
+            created = seeding.seed_data(
+                *counts,
+                tags=options['tags'],
+                seed=options['seed'],
+                batch_size=options['batch_size'],
+                search_index=options['search_index'],
+                log=self.stdout.write,
+            )
+        except ValueError as error:
+            raise CommandError(error)
+
+        summary = ', '.join(
+            f'{count} {model._meta.verbose_name_plural}'
+            for model, count in created.items()
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {summary} in {time.perf_counter() - start:.1f}s.'
+        ))
@@ -1,28 +1,115 @@
 """
 Django command to wait for the database to be available.
 """
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from psycopg2 import OperationalError as Psycopg2OpError
 
+from django.conf import settings
+from django.db import connections
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+
+# Exit status when a database is still unavailable at the deadline.
+UNAVAILABLE_EXIT_CODE = 3
+
+
+def probe(alias):
+    """Open and close a connection to a database."""
+    connection = connections[alias]
+    try:
+        connection.ensure_connection()
+    finally:
+        connection.close()
+
+
+def backoff_delays(initial, maximum):
+    """Yield exponentially growing delays with jitter."""
+    delay = initial
+    while True:
+        yield delay / 2 + random.uniform(0, delay / 2)
+        delay = min(delay * 2, maximum)
 
 
 class Command(BaseCommand):
     """Django command to wait for database."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='databases',
+            help='Database alias to wait for, may be repeated. '
+                 'Defaults to every configured database.',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=60,
+            help='Seconds to wait before giving up.',
+        )
+        parser.add_argument(
+            '--initial-delay',
+            type=float,
+            default=0.1,
+            help='Seconds to wait after the first failed attempt.',
+        )
+        parser.add_argument(
+            '--max-delay',
+            type=float,
+            default=2,
+            help='Longest wait between attempts.',
+        )
+
+    def wait_for(self, alias, deadline, delays):
+        """Probe a database until it answers, return whether it did."""
+        while True:
+            try:
+                probe(alias)
+                return True
+            except (Psycopg2OpError, OperationalError) as error:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                delay = min(next(delays), remaining)
+                reason = ' '.join(str(error).split())
+                self.stdout.write(
+                    f'Database {alias} unavailable ({reason}), '
+                    f'retrying in {delay:.2f}s...'
+                )
+                time.sleep(delay)
+
     def handle(self, *args, **options):
         """Entrypoint for command."""
+        aliases = options['databases'] or list(settings.DATABASES)
+        unknown = set(aliases) - set(settings.DATABASES)
+        if unknown:
+            names = ', '.join(sorted(unknown))
+            raise CommandError(f'Unknown database {names}.')
         self.stdout.write('Waiting for database...')
-        db_up = False
+        start = time.monotonic()
+        deadline = start + options['timeout']
 
-        while db_up is False:
-            try:
-                self.check(databases=['default'])
-                db_up = True
-            except (Psycopg2OpError, OperationalError):
-                self.stdout.write("Database unavailable, waiting 1 second...")
-                time.sleep(1)
+        with ThreadPoolExecutor(max_workers=len(aliases)) as executor:
+            ready = dict(zip(aliases, executor.map(
+                lambda alias: self.wait_for(alias, deadline, backoff_delays(
+                    options['initial_delay'],
+                    options['max_delay'],
+                )),
+                aliases,
+            )))
+        elapsed = time.monotonic() - start
+
+        unavailable = [alias for alias in aliases if not ready[alias]]
+        if unavailable:
+            raise CommandError(
+                f"Database {', '.join(unavailable)} unavailable "
+                f'after {elapsed:.2f}s.',
+                returncode=UNAVAILABLE_EXIT_CODE,
+            )
 
-        self.stdout.write(self.style.SUCCESS('Database available!'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Database available after {elapsed:.2f}s!'
+        ))
@@ -0,0 +1,59 @@
+"""
+Session, CSRF, auth and message middleware skipped on API paths.
+
+The blog and user APIs authenticate with tokens and never use sessions,
+CSRF tokens or messages. These subclasses of the stock middleware pass
+requests under API_PATH_PREFIXES straight to the next layer, so API
+requests neither load sessions nor get CSRF checks. The admin and every
+other path keep the stock behaviour. As subclasses they still satisfy the
+admin's system checks.
+"""
+from django.conf import settings
+from django.contrib.auth import middleware as auth
+from django.contrib.messages import middleware as messages
+from django.contrib.sessions import middleware as sessions
+from django.middleware import csrf
+
+
+def is_api_path(path):
+    """Return whether a path belongs to a token-authenticated API."""
+    return path.startswith(tuple(settings.API_PATH_PREFIXES))
+
+
+class SkipOnApiPathsMixin:
+    """Pass API requests through a middleware untouched."""
+
+    def __call__(self, request):
+        if is_api_path(request.path_info):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(SkipOnApiPathsMixin, sessions.SessionMiddleware):
+    """Session middleware for non-API paths."""
+
+
+class CsrfViewMiddleware(SkipOnApiPathsMixin, csrf.CsrfViewMiddleware):
+    """CSRF middleware for non-API paths."""
+
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        # Called by the handler directly, not through __call__.
+        if is_api_path(request.path_info):
+            return None
+        return super().process_view(
+            request,
+            callback,
+            callback_args,
+            callback_kwargs,
+        )
+
+
+class AuthenticationMiddleware(
+        SkipOnApiPathsMixin,
+        auth.AuthenticationMiddleware,
+):
+    """Authentication middleware for non-API paths."""
+
+
+class MessageMiddleware(SkipOnApiPathsMixin, messages.MessageMiddleware):
+    """Message middleware for non-API paths."""
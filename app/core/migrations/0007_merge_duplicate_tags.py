@@ -0,0 +1,26 @@
+# Generated by Django 4.2.9 on 2026-10-18 18:58
+
+import core.models
+from django.db import migrations
+
+
+def merge_duplicate_tags(apps, schema_editor):
+    Tag = apps.get_model('core', 'Tag')
+    Tag.objects.db_manager(schema_editor.connection.alias).merge_duplicates()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_comment_created_at_comment_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='tag',
+            managers=[
+                ('objects', core.models.TagManager()),
+            ],
+        ),
+        migrations.RunPython(merge_duplicate_tags, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:03
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import functions
+import django.db.models.deletion
+
+
+def backfill_comments_count(apps, schema_editor):
+    Blog = apps.get_model('core', 'Blog')
+    Comment = apps.get_model('core', 'Comment')
+    counts = Comment.objects.filter(
+        blog=models.OuterRef('pk'),
+    ).order_by().values('blog').annotate(
+        total=models.Count('id'),
+    ).values('total')
+    Blog.objects.using(schema_editor.connection.alias).update(
+        comments_count=functions.Coalesce(models.Subquery(counts), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_blog_comment_indexes_tag_unique_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='CommentLike',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('comment', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='likes', to='core.comment')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='commentlike',
+            constraint=models.UniqueConstraint(fields=('comment', 'user'), name='unique_comment_like'),
+        ),
+        migrations.RunPython(backfill_comments_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:12
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE core_blog_search USING fts5('
+            "title, excerpt, content, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            'INSERT INTO core_blog_search (rowid, title, excerpt, content) '
+            'SELECT id, title, excerpt, content FROM core_blog'
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'ALTER TABLE core_blog ADD COLUMN search_vector tsvector'
+        )
+        schema_editor.execute(
+            'UPDATE core_blog SET search_vector = '
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(excerpt, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+        )
+        schema_editor.execute(
+            'CREATE INDEX core_blog_search_vector_idx '
+            'ON core_blog USING gin (search_vector)'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS core_blog_search')
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'ALTER TABLE core_blog DROP COLUMN IF EXISTS search_vector'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_comment_like_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
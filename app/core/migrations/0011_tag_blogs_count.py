@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+
+def backfill_blogs_count(apps, schema_editor):
+    Tag = apps.get_model('core', 'Tag')
+    Tag.objects.db_manager(
+        schema_editor.connection.alias,
+    ).refresh_blogs_counts()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_blog_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='blogs_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_blogs_count,
+            migrations.RunPython.noop,
+        ),
+    ]
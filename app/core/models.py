@@ -1,13 +1,16 @@
 """
 Database models.
 """
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Min
+from django.db.models.functions import Coalesce, Lower
 from django.contrib.auth.models import (
     AbstractBaseUser,
     BaseUserManager,
     PermissionsMixin
 )
 from django.conf import settings
+from django.utils import timezone
 from django.core.validators import MinLengthValidator
 
 class UserManager(BaseUserManager):
@@ -39,15 +42,84 @@ class User(AbstractBaseUser, PermissionsMixin):
     name = models.CharField(max_length=254)
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=True)
+    # Maintained by Follow.objects.follow() and unfollow().
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
 
     objects = UserManager()
 
     USERNAME_FIELD = 'email'
 
 
+class TagManager(models.Manager):
+    """Manager for tags."""
+    use_in_migrations = True
+
+    def merge_duplicates(self):
+        """Fold tags whose names differ only by case into the oldest one.
+
+        Blogs linked to a duplicate are relinked to the kept tag. Return
+        the number of tags removed.
+        """
+        through = self.model._meta.get_field('blog').through
+        by_name = self.annotate(name_lower=Lower('name'))
+        duplicates = by_name.values('name_lower').annotate(
+            total=Count('id'),
+            keep=Min('id'),
+        ).filter(total__gt=1)
+
+        removed = 0
+        with transaction.atomic(using=self.db):
+            for duplicate in duplicates:
+                keep = duplicate['keep']
+                drop = list(by_name.filter(
+                    name_lower=duplicate['name_lower'],
+                ).exclude(id=keep).values_list('id', flat=True))
+                linked = through.objects.filter(
+                    tag_id=keep,
+                ).values('blog_id')
+                blog_ids = through.objects.filter(
+                    tag_id__in=drop,
+                ).exclude(blog_id__in=linked).values_list(
+                    'blog_id',
+                    flat=True,
+                ).distinct()
+                through.objects.bulk_create([
+                    through(blog_id=blog_id, tag_id=keep)
+                    for blog_id in blog_ids
+                ])
+                self.filter(id__in=drop).delete()
+                removed += len(drop)
+
+        return removed
+
+    def refresh_blogs_counts(self):
+        """Recount the blogs of every tag from the through table."""
+        through = self.model._meta.get_field('blog').through
+        counts = through.objects.filter(
+            tag_id=models.OuterRef('pk'),
+        ).order_by().values('tag_id').annotate(
+            total=Count('id'),
+        ).values('total')
+        return self.update(
+            blogs_count=Coalesce(models.Subquery(counts), 0),
+        )
+
+
 class Tag(models.Model):
     """Tag for filtering recipes."""
     name = models.CharField(max_length=255)
+    # Maintained by core.signals when blogs are tagged, untagged or deleted.
+    blogs_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = TagManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                Lower('name'),
+                name='unique_tag_name_ci',
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -58,14 +130,29 @@ class Blog(models.Model):
     title = models.CharField(max_length=50, blank=False)
     excerpt = models.TextField(blank=False)
     content = models.TextField(blank=False)
+    # Covered by blog_author_created_idx.
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        db_index=False,
         )
     tags = models.ManyToManyField('Tag')
+    # Maintained by core.signals on comment create and delete.
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['author', '-created_at'],
+                name='blog_author_created_idx',
+            ),
+            models.Index(fields=['-created_at'], name='blog_created_idx'),
+            # Newest posts of an author first, for feeds read on demand.
+            models.Index(fields=['author', '-id'], name='blog_author_id_idx'),
+        ]
+
     def __str__(self):
         return self.title
     
@@ -74,10 +161,165 @@ class Comment(models.Model):
     """Comment model."""
     comment_text = models.CharField(max_length=255, validators=[MinLengthValidator(1)])
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
-    blog = models.ForeignKey('Blog', related_name='comments', on_delete=models.CASCADE)
-    likes_count = models.PositiveIntegerField()
+    # Covered by comment_blog_id_idx.
+    blog = models.ForeignKey(
+        'Blog',
+        related_name='comments',
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    # Maintained by CommentLike.objects.like() and unlike().
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['blog', '-id'], name='comment_blog_id_idx'),
+        ]
+
     def __str__(self):
         return self.comment_text
+
+
+class CommentLikeManager(models.Manager):
+    """Manager for comment likes."""
+
+    def like(self, comment, user):
+        """Like a comment once per user, return whether it was new."""
+        with transaction.atomic(using=self.db):
+            _, created = self.get_or_create(comment=comment, user=user)
+            if created:
+                Comment.objects.filter(id=comment.id).update(
+                    likes_count=models.F('likes_count') + 1,
+                    updated_at=timezone.now(),
+                )
+
+        return created
+
+    def unlike(self, comment, user):
+        """Remove a user's like, return whether there was one."""
+        with transaction.atomic(using=self.db):
+            deleted, _ = self.filter(comment=comment, user=user).delete()
+            if deleted:
+                Comment.objects.filter(id=comment.id).update(
+                    likes_count=models.F('likes_count') - 1,
+                    updated_at=timezone.now(),
+                )
+
+        return bool(deleted)
+
+
+class CommentLike(models.Model):
+    """A user's like on a comment."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    # Covered by unique_comment_like.
+    comment = models.ForeignKey(
+        'Comment',
+        related_name='likes',
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CommentLikeManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['comment', 'user'],
+                name='unique_comment_like',
+            ),
+        ]
+
+
+class FollowManager(models.Manager):
+    """Manager for follows."""
+
+    def follow(self, follower, author):
+        """Follow an author once, return whether it was new."""
+        with transaction.atomic(using=self.db):
+            _, created = self.get_or_create(follower=follower, author=author)
+            if created:
+                User.objects.filter(id=author.id).update(
+                    followers_count=models.F('followers_count') + 1,
+                )
+
+        return created
+
+    def unfollow(self, follower, author):
+        """Stop following an author and drop their posts from the feed.
+
+        Return whether there was a follow.
+        """
+        with transaction.atomic(using=self.db):
+            deleted, _ = self.filter(follower=follower, author=author).delete()
+            if deleted:
+                User.objects.filter(id=author.id).update(
+                    followers_count=models.F('followers_count') - 1,
+                )
+                FeedEntry.objects.filter(
+                    user=follower,
+                    blog__author=author,
+                ).delete()
+
+        return bool(deleted)
+
+
+class Follow(models.Model):
+    """A user following the posts of an author."""
+    # Covered by unique_follow.
+    follower = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='following',
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='followers',
+        on_delete=models.CASCADE,
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = FollowManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['follower', 'author'],
+                name='unique_follow',
+            ),
+            models.CheckConstraint(
+                check=~models.Q(follower=models.F('author')),
+                name='follow_not_self',
+            ),
+        ]
+
+
+class FeedEntry(models.Model):
+    """A post in the feed of a user, written when the post is published."""
+    # Covered by unique_feed_entry.
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='feed_entries',
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    blog = models.ForeignKey(
+        'Blog',
+        related_name='feed_entries',
+        on_delete=models.CASCADE,
+    )
+
+    class Meta:
+        constraints = [
+            # Also serves reading a feed newest first from a cursor.
+            models.UniqueConstraint(
+                fields=['user', 'blog'],
+                name='unique_feed_entry',
+            ),
+        ]
@@ -0,0 +1,131 @@
+"""
+Routing of safe reads to database replicas.
+
+Queries go to the primary unless ReplicaPinningMiddleware has let the
+current request read from a replica: a GET or HEAD request to a view
+whose class sets read_from_replica. Any write pins the rest of the
+request to the primary, and the response sets a cookie keeping the
+client on the primary for REPLICA_LAG_SECONDS, so it reads its own
+writes while the replicas catch up.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'db_pin_primary'
+SAFE_METHODS = ('GET', 'HEAD')
+
+current_routing = ContextVar('current_routing', default=None)
+
+
+class RoutingState:
+    """Where the queries of one request may go."""
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.replica = None
+        self.wrote = False
+        self.replica_used = False
+
+
+def read_from_replica():
+    """Return whether the current request has read from a replica."""
+    state = current_routing.get()
+    return state is not None and state.replica_used
+
+
+class ReplicaRouter:
+    """Send unpinned reads to a replica, everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        state = current_routing.get()
+        if state is None or state.pinned or state.replica is None:
+            return DEFAULT_DB_ALIAS
+        state.replica_used = True
+
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.pinned = True
+            state.wrote = True
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """Track whether each request may read from a replica."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        state = self.start(request)
+        token = current_routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+        return self.finish(state, response)
+
+    async def __acall__(self, request):
+        state = self.start(request)
+        token = current_routing.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+        return self.finish(state, response)
+
+    def start(self, request):
+        """Return the routing state of a request."""
+        return RoutingState(pinned=(
+            request.method not in SAFE_METHODS
+            or PIN_COOKIE in request.COOKIES
+        ))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Pick a replica for safe requests to views reading from one."""
+        state = current_routing.get()
+        view_class = getattr(view_func, 'cls', None)
+        if (
+            state is not None
+            and not state.pinned
+            and settings.DATABASE_REPLICAS
+            and getattr(view_class, 'read_from_replica', False)
+        ):
+            state.replica = random.choice(settings.DATABASE_REPLICAS)
+
+    def finish(self, state, response):
+        """Pin clients that wrote to the primary."""
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE,
+                '1',
+                max_age=settings.REPLICA_LAG_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+
+        return response
@@ -0,0 +1,130 @@
+"""
+OpenAPI schema generated ahead of time and served from disk.
+
+build_schema writes the schema to OPENAPI_SCHEMA_PATH, headed by a
+comment holding the SHA-256 of the rest of the file. The views serve
+that file as is, with the hash as a strong ETag, instead of introspecting
+every viewset on each request. Without a stored schema it is generated
+once, on first use. `?format=json` serves the same schema as JSON.
+"""
+import functools
+import hashlib
+import json
+import logging
+
+import yaml
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_safe
+from drf_spectacular.renderers import OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularSwaggerView
+
+logger = logging.getLogger(__name__)
+
+HASH_PREFIX = b'# sha256: '
+CONTENT_TYPE = 'application/vnd.oai.openapi; charset=utf-8'
+JSON_CONTENT_TYPE = 'application/vnd.oai.openapi+json'
+# Hashed URLs never change content, so clients may keep them for a year.
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def generate_schema():
+    """Return the schema of the API as YAML, headed by its hash."""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    body = OpenApiYamlRenderer().render(schema, renderer_context={})
+    digest = hashlib.sha256(body).hexdigest()
+
+    return HASH_PREFIX + digest.encode() + b'\n' + body
+
+
+def schema_hash(content):
+    """Return the hash heading a schema."""
+    header = content.split(b'\n', 1)[0]
+    return header[len(HASH_PREFIX):].decode()
+
+
+def read_schema():
+    """Return the stored schema, or None if there is none."""
+    try:
+        with open(settings.OPENAPI_SCHEMA_PATH, 'rb') as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def load_schema():
+    """Return the schema to serve and its hash."""
+    content = read_schema()
+    if content is None:
+        logger.warning(
+            'No stored schema at %s, generating it. Run build_schema.',
+            settings.OPENAPI_SCHEMA_PATH,
+        )
+        content = generate_schema()
+
+    return content, schema_hash(content)
+
+
+@functools.lru_cache(maxsize=1)
+def schema_as_json(content):
+    """Return a YAML schema converted to JSON."""
+    return json.dumps(yaml.safe_load(content)).encode()
+
+
+def wants_json(request):
+    """Return whether a request asks for the schema as JSON."""
+    return request.GET.get('format') == 'json'
+
+
+def schema_etag(request, *args, **kwargs):
+    """Return the ETag of the schema, distinct for each format."""
+    digest = load_schema()[1]
+    if wants_json(request):
+        return f'{digest}-json'
+
+    return digest
+
+
+def schema_response(request):
+    """Return a response serving the schema in the requested format."""
+    content = load_schema()[0]
+    if wants_json(request):
+        return HttpResponse(
+            schema_as_json(content),
+            content_type=JSON_CONTENT_TYPE,
+        )
+
+    return HttpResponse(content, content_type=CONTENT_TYPE)
+
+
+@require_safe
+@cache_control(public=True, no_cache=True)
+@condition(etag_func=schema_etag)
+def schema_view(request):
+    """Serve the schema, revalidated by clients on every use."""
+    return schema_response(request)
+
+
+@require_safe
+@cache_control(public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+@condition(etag_func=schema_etag)
+def hashed_schema_view(request, digest):
+    """Serve the schema under a URL that changes with its content."""
+    if digest != load_schema()[1]:
+        raise Http404('No such schema version.')
+
+    return schema_response(request)
+
+
+class SwaggerView(SpectacularSwaggerView):
+    """Swagger UI loading the schema from its hashed URL."""
+
+    @property
+    def url(self):
+        return reverse('api-schema-hashed', args=[load_schema()[1]])
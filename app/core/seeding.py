@@ -0,0 +1,248 @@
+"""
+Fast generation of synthetic users, tags, blogs and comments.
+
+Rows are built in memory and written with bulk_create, skipping model
+signals, so every user shares one precomputed password hash, blog tags
+are inserted straight into the through table and the denormalized
+counters are computed up front. The same seed always produces the same
+rows, whatever the batch size.
+"""
+import itertools
+import random
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from blog.search import rebuild_index
+from core.models import Blog, Comment, Tag, User
+
+BATCH_SIZE = 5_000
+PASSWORD = 'seed-password'
+MAX_TAGS_PER_BLOG = 4
+# Distinct sentences the text is assembled from; enough to keep search
+# and compression realistic without generating every sentence anew.
+SENTENCE_POOL = 5_000
+
+FIRST_NAMES = [
+    'Alex', 'Amara', 'Ben', 'Carla', 'Chen', 'Dana', 'Elif', 'Farid',
+    'Grace', 'Hugo', 'Ines', 'Jonas', 'Kofi', 'Lena', 'Mateo', 'Nadia',
+    'Omar', 'Priya', 'Quinn', 'Rosa', 'Sami', 'Tara', 'Umar', 'Vera',
+    'Wei', 'Yara', 'Zoe',
+]
+LAST_NAMES = [
+    'Adams', 'Berg', 'Costa', 'Dubois', 'Evans', 'Fischer', 'Garcia',
+    'Haddad', 'Ito', 'Jensen', 'Kowalski', 'Lopez', 'Mensah', 'Novak',
+    'Okafor', 'Patel', 'Rossi', 'Silva', 'Tanaka', 'Ueda', 'Varga',
+    'Wong', 'Yilmaz', 'Zhang',
+]
+TOPICS = [
+    'python', 'django', 'databases', 'performance', 'testing', 'devops',
+    'security', 'frontend', 'career', 'design', 'cloud', 'linux',
+    'postgres', 'caching', 'async', 'api', 'docker', 'kubernetes',
+    'javascript', 'rust', 'go', 'data', 'machine-learning', 'networking',
+    'open-source', 'productivity', 'architecture', 'observability',
+    'mobile', 'accessibility',
+]
+WORDS = [
+    'query', 'index', 'cache', 'request', 'response', 'server', 'client',
+    'latency', 'throughput', 'model', 'view', 'template', 'migration',
+    'schema', 'table', 'row', 'column', 'transaction', 'lock', 'thread',
+    'process', 'memory', 'disk', 'network', 'packet', 'queue', 'worker',
+    'deploy', 'release', 'build', 'test', 'bug', 'fix', 'feature',
+    'review', 'team', 'project', 'design', 'pattern', 'function', 'class',
+    'module', 'package', 'library', 'framework', 'tool', 'script',
+    'config', 'setting', 'token', 'user', 'session', 'password', 'error',
+    'log', 'metric', 'trace', 'alert', 'dashboard', 'backup', 'replica',
+    'shard', 'cluster', 'container', 'image', 'volume', 'endpoint',
+    'route', 'payload', 'format', 'parser', 'compiler', 'runtime',
+    'benchmark', 'profile', 'budget', 'estimate', 'plan', 'goal',
+    'fast', 'slow', 'simple', 'robust', 'careful', 'small', 'large',
+    'new', 'old', 'better', 'clean', 'stable', 'broken', 'hidden',
+    'makes', 'needs', 'breaks', 'keeps', 'turns', 'shows', 'hides',
+    'runs', 'saves', 'loads', 'checks', 'moves', 'writes', 'reads',
+]
+
+
+def batched(iterable, size=BATCH_SIZE):
+    """Yield lists of up to size items."""
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def sentence(rng):
+    """Return a random sentence."""
+    words = rng.choices(WORDS, k=rng.randint(6, 16))
+    return ' '.join(words).capitalize() + '.'
+
+
+class TextGenerator:
+    """Assemble titles, excerpts, paragraphs and comments from sentences."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.sentences = [sentence(rng) for _ in range(SENTENCE_POOL)]
+
+    def sentences_text(self, low, high):
+        """Return between low and high sentences."""
+        return ' '.join(
+            self.rng.choices(self.sentences, k=self.rng.randint(low, high))
+        )
+
+    def title(self):
+        """Return a blog title."""
+        words = self.rng.choices(WORDS, k=self.rng.randint(3, 7))
+        return ' '.join(words).capitalize()[:50]
+
+    def content(self):
+        """Return a blog body of a few paragraphs."""
+        return '\n\n'.join(
+            self.sentences_text(3, 8)
+            for _ in range(self.rng.randint(3, 8))
+        )
+
+    def comment(self):
+        """Return a comment text."""
+        return self.sentences_text(1, 3)[:255]
+
+
+def skewed_weights(count):
+    """Return cumulative weights making earlier items more popular."""
+    return list(itertools.accumulate(1 / (i + 1) for i in range(count)))
+
+
+def draw(rng, population, cum_weights, count):
+    """Return count items drawn with replacement by cumulative weight."""
+    if not count:
+        return []
+    return rng.choices(population, cum_weights=cum_weights, k=count)
+
+
+def tag_names(count):
+    """Return count distinct tag names, plain topics first."""
+    names = TOPICS[:count]
+    suffix = 2
+    while len(names) < count:
+        names += [f'{topic}-{suffix}' for topic in TOPICS][:count - len(names)]
+        suffix += 1
+
+    return names
+
+
+def seed_data(users, blogs, comments, tags=None, seed=0,
+              batch_size=BATCH_SIZE, search_index=True, log=None):
+    """Insert synthetic rows, return the number created of each model.
+
+    Tags default to a hundredth of the blogs. Tag popularity and the
+    number of blogs per author and comments per blog are skewed, the way
+    they are on real sites. Emails and tag names are derived from the
+    seed and position, so seeding again with another seed adds to the
+    existing data.
+    """
+    if users < 1 and (blogs or comments):
+        raise ValueError('Blogs and comments need at least one user.')
+    if blogs < 1 and comments:
+        raise ValueError('Comments need at least one blog.')
+    rng = random.Random(seed)
+    text = TextGenerator(rng)
+    log = log or (lambda message: None)
+    if tags is None:
+        tags = max(10, blogs // 100)
+    created = {}
+
+    with transaction.atomic():
+        log(f'Creating {users} user(s)...')
+        password = make_password(PASSWORD)
+        user_ids = []
+        for batch in batched((
+                User(
+                    email=f'seed{seed}-user{i}@example.com',
+                    name=f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                    password=password,
+                    is_staff=False,
+                )
+                for i in range(users)
+        ), batch_size):
+            user_ids += [user.id for user in User.objects.bulk_create(batch)]
+        created[User] = len(user_ids)
+
+        log(f'Creating {tags} tag(s)...')
+        names = tag_names(tags)
+        Tag.objects.bulk_create(
+            [Tag(name=name) for name in names],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+        ids = dict(Tag.objects.annotate(
+            name_lower=Lower('name'),
+        ).filter(name_lower__in=names).values_list('name_lower', 'id'))
+        # Ordered by popularity.
+        tag_ids = [ids[name] for name in names]
+        created[Tag] = len(names)
+
+        author_weights = skewed_weights(len(user_ids))
+        blog_authors = draw(rng, user_ids, author_weights, blogs)
+        comment_authors = draw(rng, user_ids, author_weights, comments)
+        # Draw every comment's blog first so each blog is created with
+        # its final comments_count.
+        blog_order = list(range(blogs))
+        rng.shuffle(blog_order)
+        comment_blogs = draw(rng, blog_order, skewed_weights(blogs), comments)
+        comments_per_blog = Counter(comment_blogs)
+
+        log(f'Creating {blogs} blog(s)...')
+        blog_ids = []
+        for batch in batched((
+                Blog(
+                    author_id=blog_authors[i],
+                    title=text.title(),
+                    excerpt=text.sentences_text(1, 2),
+                    content=text.content(),
+                    comments_count=comments_per_blog[i],
+                )
+                for i in range(blogs)
+        ), batch_size):
+            blog_ids += [blog.id for blog in Blog.objects.bulk_create(batch)]
+        created[Blog] = len(blog_ids)
+
+        log('Tagging blogs...')
+        tag_weights = skewed_weights(len(tag_ids))
+        Link = Blog.tags.through
+
+        def links():
+            if not tag_ids:
+                return
+            for blog_id in blog_ids:
+                chosen = set(draw(
+                    rng,
+                    tag_ids,
+                    tag_weights,
+                    rng.randint(0, MAX_TAGS_PER_BLOG),
+                ))
+                for tag_id in sorted(chosen):
+                    yield Link(blog_id=blog_id, tag_id=tag_id)
+
+        for batch in batched(links(), batch_size):
+            Link.objects.bulk_create(batch)
+        Tag.objects.refresh_blogs_counts()
+
+        log(f'Creating {comments} comment(s)...')
+        created[Comment] = 0
+        for batch in batched((
+                Comment(
+                    blog_id=blog_ids[blog],
+                    author_id=author_id,
+                    comment_text=text.comment(),
+                )
+                for blog, author_id in zip(comment_blogs, comment_authors)
+        ), batch_size):
+            Comment.objects.bulk_create(batch)
+            created[Comment] += len(batch)
+
+        if search_index and blogs:
+            log('Rebuilding the search index...')
+            rebuild_index()
+
+    return created
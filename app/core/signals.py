@@ -0,0 +1,120 @@
+"""
+Signal handlers keeping denormalized counters and timestamps in sync.
+
+Blog.updated_at moves whenever anything a blog renders changes, so it
+can back Last-Modified validators. Each handler writes to the database
+the change was made on.
+"""
+from django.db.models import F, QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import Blog, Comment, Tag
+
+
+@receiver(post_save, sender=Comment)
+def increment_comments_count(sender, instance, created, using, **kwargs):
+    """Count a new comment on its blog."""
+    if created:
+        Blog.objects.using(using).filter(id=instance.blog_id).update(
+            comments_count=F('comments_count') + 1,
+            updated_at=timezone.now(),
+        )
+
+
+def deletes_blog(origin, blog_id):
+    """Return whether a deletion started from the given blog."""
+    if isinstance(origin, QuerySet):
+        # Cascades from a blog queryset only reach comments of its blogs.
+        return origin.model is Blog
+    return isinstance(origin, Blog) and origin.pk == blog_id
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comments_count(sender, instance, using, origin=None, **kwargs):
+    """Uncount a deleted comment from its blog.
+
+    Comments deleted along with their blog are skipped, rather than
+    updating the blog once for each of them.
+    """
+    if deletes_blog(origin, instance.blog_id):
+        return
+    Blog.objects.using(using).filter(id=instance.blog_id).update(
+        comments_count=F('comments_count') - 1,
+        updated_at=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Tag)
+def touch_tagged_blogs(sender, instance, created, using, **kwargs):
+    """Mark blogs showing a renamed tag as modified."""
+    if not created:
+        Blog.objects.using(using).filter(tags=instance).update(
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(pre_delete, sender=Tag)
+def touch_untagged_blogs(sender, instance, using, **kwargs):
+    """Mark blogs losing a deleted tag as modified."""
+    Blog.objects.using(using).filter(tags=instance).update(
+        updated_at=timezone.now(),
+    )
+
+
+def adjust_blogs_count(tag_ids, delta, using):
+    """Add delta to the blog count of each tag."""
+    Tag.objects.using(using).filter(id__in=tag_ids).update(
+        blogs_count=F('blogs_count') + delta,
+    )
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def count_tagged_blogs(sender, instance, action, reverse, pk_set, using,
+                       **kwargs):
+    """Keep Tag.blogs_count in step with tagging from either side.
+
+    Removals are counted before the rows go, as pk_set may name rows
+    that were never linked and is empty when clearing.
+    """
+    if action in ('pre_remove', 'pre_clear'):
+        links = sender.objects.using(using).filter(**{
+            'tag_id' if reverse else 'blog_id': instance.pk,
+        })
+        if pk_set is not None:
+            links = links.filter(**{
+                'blog_id__in' if reverse else 'tag_id__in': pk_set,
+            })
+        instance._unlinked = (
+            links.count() if reverse
+            else list(links.values_list('tag_id', flat=True))
+        )
+    elif action in ('post_remove', 'post_clear'):
+        unlinked = instance.__dict__.pop('_unlinked', [])
+        if reverse:
+            adjust_blogs_count([instance.pk], -unlinked, using)
+        else:
+            adjust_blogs_count(unlinked, -1, using)
+    elif action == 'post_add':
+        if reverse:
+            adjust_blogs_count([instance.pk], len(pk_set), using)
+        else:
+            adjust_blogs_count(pk_set, 1, using)
+
+
+@receiver(pre_delete, sender=Blog)
+def uncount_deleted_blog(sender, instance, using, **kwargs):
+    """Uncount a deleted blog from its tags."""
+    adjust_blogs_count(
+        Blog.tags.through.objects.using(using).filter(
+            blog_id=instance.pk,
+        ).values('tag_id'),
+        -1,
+        using,
+    )
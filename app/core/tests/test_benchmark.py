@@ -0,0 +1,69 @@
+"""
+Tests for the endpoint benchmarks.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+
+from core import benchmark
+from core.models import Blog, Comment, Tag, User
+
+
+class BenchmarkTests(TestCase):
+    """Test seeding datasets and running the scenarios."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_seed_dataset(self):
+        """Test seeding creates the dataset with consistent counters."""
+        benchmark.seed_dataset(20)
+
+        self.assertEqual(Blog.objects.count(), 20)
+        self.assertEqual(Comment.objects.count(), 20)
+        self.assertEqual(User.objects.count(), 10)
+        self.assertEqual(Tag.objects.count(), 10)
+        self.assertEqual(
+            sum(Blog.objects.values_list('comments_count', flat=True)),
+            20,
+        )
+        self.assertEqual(
+            sum(Tag.objects.values_list('blogs_count', flat=True)),
+            Blog.tags.through.objects.count(),
+        )
+
+    def test_scenarios_cover_every_route(self):
+        """Test every blog and user API route has a scenario."""
+        routes = {scenario.route for scenario in benchmark.SCENARIOS}
+
+        self.assertEqual(benchmark.api_routes() - routes, set())
+
+    def test_run_benchmark(self):
+        """Test every scenario succeeds and reports its metrics."""
+        benchmark.seed_dataset(20)
+
+        results = benchmark.run_benchmark(requests=2, seed=0)
+
+        self.assertEqual(
+            set(results),
+            {scenario.name for scenario in benchmark.SCENARIOS},
+        )
+        for name, metrics in results.items():
+            self.assertTrue(
+                all(200 <= status < 300 for status in metrics['statuses']),
+                (name, metrics['statuses']),
+            )
+            self.assertLessEqual(metrics['p50_ms'], metrics['p99_ms'])
+
+    def test_compare(self):
+        """Test comparing runs reports relative changes."""
+        baseline = {'blog-list': {'p50_ms': 2.0, 'p99_ms': 4.0,
+                                  'throughput_rps': 100.0,
+                                  'queries_mean': 4.0}}
+        results = {'blog-list': {'p50_ms': 1.0, 'p99_ms': 5.0,
+                                 'throughput_rps': 150.0,
+                                 'queries_mean': 4.0}}
+
+        self.assertEqual(benchmark.compare(baseline, results), {
+            'blog-list': {'p50_ms': -50.0, 'p99_ms': 25.0,
+                          'throughput_rps': 50.0, 'queries_mean': 0.0},
+        })
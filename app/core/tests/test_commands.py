@@ -1,35 +1,86 @@
 """
 Tests custom Django management commands.
 """
-
-from unittest.mock import patch
+from io import StringIO
+from unittest.mock import call, patch
 
 from psycopg2 import OperationalError as Psycopg2Error
 
+from django.conf import settings
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.db.utils import OperationalError
 from django.test import SimpleTestCase
 
+from core.management.commands.wait_for_db import (
+    UNAVAILABLE_EXIT_CODE,
+    backoff_delays,
+)
+
 
-@patch('core.management.commands.wait_for_db.Command.check')
+@patch('core.management.commands.wait_for_db.probe')
 class CommandTests(SimpleTestCase):
     """Test commands."""
 
-    def test_wait_for_db_ready(self, patched_check):
+    def test_wait_for_db_ready(self, patched_probe):
         """Test waiting for database if database is ready."""
-        patched_check.return_value = True
+        out = StringIO()
 
-        call_command('wait_for_db')
+        call_command('wait_for_db', stdout=out)
 
-        patched_check.assert_called_once_with(databases=['default'])
+        patched_probe.assert_called_once_with('default')
+        self.assertIn('Database available after', out.getvalue())
 
     @patch('time.sleep')
-    def test_wait_for_db_delay(self, patched_sleep, patched_check):
+    def test_wait_for_db_delay(self, patched_sleep, patched_probe):
         """Test waiting for database when getting OperationalError."""
-        patched_check.side_effect = [Psycopg2Error] * 2 \
-            + [OperationalError] * 3 + [True]
+        patched_probe.side_effect = [Psycopg2Error] * 2 \
+            + [OperationalError] * 3 + [None]
+
+        call_command('wait_for_db', stdout=StringIO())
+
+        self.assertEqual(patched_probe.call_count, 6)
+        patched_probe.assert_called_with('default')
+        self.assertEqual(patched_sleep.call_count, 5)
+
+    def test_wait_for_db_probes_every_alias(self, patched_probe):
+        """Test every configured database is waited for."""
+        databases = {'replica': settings.DATABASES['default']}
+        with patch.dict(settings.DATABASES, databases):
+            call_command('wait_for_db', stdout=StringIO())
+
+        patched_probe.assert_has_calls(
+            [call('default'), call('replica')],
+            any_order=True,
+        )
+
+    @patch('time.sleep')
+    def test_wait_for_db_deadline(self, patched_sleep, patched_probe):
+        """Test giving up with an error once the deadline passes."""
+        patched_probe.side_effect = OperationalError
+
+        with patch('time.monotonic', side_effect=[0, 1, 2, 31, 31]):
+            with self.assertRaises(CommandError) as error:
+                call_command('wait_for_db', timeout=30, stdout=StringIO())
+
+        self.assertEqual(error.exception.returncode, UNAVAILABLE_EXIT_CODE)
+        self.assertIn('default', str(error.exception))
+        self.assertEqual(patched_probe.call_count, 3)
+        self.assertEqual(patched_sleep.call_count, 2)
+
+    def test_wait_for_db_unknown_alias(self, patched_probe):
+        """Test waiting for an unknown database is an error."""
+        with self.assertRaises(CommandError):
+            call_command('wait_for_db', database=['replica'])
+
+        patched_probe.assert_not_called()
 
-        call_command('wait_for_db')
+    def test_backoff_delays(self, patched_probe):
+        """Test delays double up to the maximum, with jitter."""
+        delays = backoff_delays(0.1, 0.4)
 
-        self.assertEqual(patched_check.call_count, 6)
-        patched_check.assert_called_with(databases=['default'])
+        bounds = [0.1, 0.2, 0.4, 0.4]
+        for bound in bounds:
+            delay = next(delays)
+            self.assertGreaterEqual(delay, bound / 2)
+            self.assertLessEqual(delay, bound)
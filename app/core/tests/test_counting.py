@@ -0,0 +1,132 @@
+"""
+Tests for estimated row counts.
+"""
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.counting import EstimatedCountPaginator, estimated_count
+from core.models import Blog
+
+
+def create_blogs(author, count):
+    """Create count blogs."""
+    Blog.objects.bulk_create(
+        Blog(author=author, title=f'Blog {i}', excerpt='Excerpt.',
+             content='Content.')
+        for i in range(count)
+    )
+
+
+def analyze():
+    """Refresh the planner statistics."""
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+@override_settings(ESTIMATED_COUNT_THRESHOLD=5)
+class EstimatedCountTests(TestCase):
+    """Test counting querysets."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='test123',
+        )
+
+    def test_small_counts_exact(self):
+        """Test counts below the threshold are exact and not cached."""
+        create_blogs(self.user, 3)
+        analyze()
+        create_blogs(self.user, 1)
+
+        self.assertEqual(estimated_count(Blog.objects.all()), 4)
+        create_blogs(self.user, 1)
+        self.assertEqual(estimated_count(Blog.objects.all()), 5)
+
+    @skipUnless(connection.vendor == 'sqlite', 'Needs sqlite statistics.')
+    def test_large_unfiltered_count_estimated(self):
+        """Test large tables are counted from planner statistics."""
+        create_blogs(self.user, 6)
+        analyze()
+        create_blogs(self.user, 2)
+
+        with self.assertNumQueries(1):
+            count = estimated_count(Blog.objects.order_by('-id'))
+
+        self.assertEqual(count, 6)
+
+    def test_large_count_cached_per_filter(self):
+        """Test large counts are cached for each filter."""
+        create_blogs(self.user, 6)
+        blogs = Blog.objects.filter(author=self.user)
+        self.assertEqual(estimated_count(blogs), 6)
+        create_blogs(self.user, 1)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(estimated_count(blogs), 6)
+        self.assertEqual(estimated_count(blogs.filter(title='Blog 0')), 2)
+
+    def test_empty_queryset(self):
+        """Test empty querysets are counted without a query."""
+        with self.assertNumQueries(0):
+            self.assertEqual(estimated_count(Blog.objects.none()), 0)
+
+    @skipUnless(connection.vendor == 'postgresql', 'Needs PostgreSQL.')
+    def test_large_filtered_count_estimated(self):
+        """Test filtered querysets are estimated by the planner."""
+        create_blogs(self.user, 50)
+        analyze()
+
+        count = estimated_count(Blog.objects.filter(author=self.user))
+
+        self.assertGreaterEqual(count, 5)
+
+    def test_paginator(self):
+        """Test the paginator counts querysets and plain lists."""
+        create_blogs(self.user, 3)
+
+        self.assertEqual(
+            EstimatedCountPaginator(Blog.objects.order_by('id'), 2).count,
+            3,
+        )
+        self.assertEqual(EstimatedCountPaginator([1, 2], 2).count, 2)
+
+    @skipUnless(connection.vendor == 'sqlite', 'Needs sqlite statistics.')
+    def test_paginator_reaches_rows_past_estimate(self):
+        """Test rows past a stale estimate are still paged through."""
+        create_blogs(self.user, 6)
+        analyze()
+        create_blogs(self.user, 3)
+        paginator = EstimatedCountPaginator(Blog.objects.order_by('id'), 4)
+
+        self.assertEqual(paginator.count, 6)
+        self.assertEqual(paginator.num_pages, 2)
+        page = paginator.page(2)
+        self.assertEqual(len(page), 4)
+        self.assertTrue(page.has_next())
+        page = paginator.page(page.next_page_number())
+        self.assertEqual(len(page), 1)
+        self.assertFalse(page.has_next())
+        self.assertEqual(page.end_index(), 9)
+        with self.assertRaises(EmptyPage):
+            paginator.page(4)
+
+    def test_paginator_orphans(self):
+        """Test orphans are kept on the last page."""
+        create_blogs(self.user, 5)
+        paginator = EstimatedCountPaginator(
+            Blog.objects.order_by('id'),
+            4,
+            orphans=1,
+        )
+
+        page = paginator.page(1)
+
+        self.assertEqual(len(page), 5)
+        self.assertFalse(page.has_next())
@@ -0,0 +1,128 @@
+"""
+Tests for the database settings.
+"""
+from pathlib import Path
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from app.database import database_settings, replica_aliases
+
+
+BASE_DIR = Path('/srv/app')
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    """Test building the database settings from the environment."""
+
+    def test_sqlite_without_host(self):
+        """Test sqlite is used when no database host is given."""
+        databases = database_settings({}, BASE_DIR)
+
+        self.assertEqual(databases['default'], {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        })
+
+    def test_postgres_with_persistent_connections(self):
+        """Test Postgres connections persist and are health checked."""
+        databases = database_settings({
+            'DB_HOST': 'db',
+            'DB_NAME': 'devdb',
+            'DB_USER': 'devuser',
+            'DB_PASS': 'changeme',
+        }, BASE_DIR)
+
+        database = databases['default']
+        self.assertEqual(database['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(
+            (database['HOST'], database['NAME'], database['USER'],
+             database['PASSWORD']),
+            ('db', 'devdb', 'devuser', 'changeme'),
+        )
+        self.assertEqual(database['CONN_MAX_AGE'], 60)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['OPTIONS'], {'connect_timeout': 5})
+        self.assertNotIn('DISABLE_SERVER_SIDE_CURSORS', database)
+
+    def test_postgres_connection_options(self):
+        """Test connection lifetime and health checks can be tuned."""
+        database = database_settings({
+            'DB_HOST': 'db',
+            'DB_PORT': '5433',
+            'DB_CONN_MAX_AGE': '0',
+            'DB_CONN_HEALTH_CHECKS': 'false',
+            'DB_CONNECT_TIMEOUT': '2',
+        }, BASE_DIR)['default']
+
+        self.assertEqual(database['PORT'], '5433')
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertFalse(database['CONN_HEALTH_CHECKS'])
+        self.assertEqual(database['OPTIONS'], {'connect_timeout': 2})
+
+    def test_pgbouncer_disables_server_side_cursors(self):
+        """Test pooling through PgBouncer disables server-side cursors."""
+        database = database_settings({
+            'DB_HOST': 'pgbouncer',
+            'DB_PORT': '6432',
+            'DB_POOL': 'pgbouncer',
+        }, BASE_DIR)['default']
+
+        self.assertTrue(database['DISABLE_SERVER_SIDE_CURSORS'])
+
+    def test_sqlite_replicas(self):
+        """Test sqlite replicas are separate files with their own aliases."""
+        databases = database_settings({
+            'DB_NAME': 'primary.sqlite3',
+            'DB_REPLICAS': 'replica1.sqlite3, replica2.sqlite3',
+        }, BASE_DIR)
+
+        self.assertEqual(databases['replica2'], {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': 'replica2.sqlite3',
+        })
+        self.assertEqual(replica_aliases(databases), ['replica1', 'replica2'])
+
+    def test_postgres_replicas(self):
+        """Test Postgres replicas share the primary's settings but host."""
+        databases = database_settings({
+            'DB_HOST': 'db',
+            'DB_NAME': 'devdb',
+            'DB_REPLICAS': 'db-replica',
+        }, BASE_DIR)
+
+        replica = databases['replica1']
+        self.assertEqual(replica['HOST'], 'db-replica')
+        self.assertEqual(replica['NAME'], 'devdb')
+        self.assertEqual(replica['TEST'], {'MIRROR': 'default'})
+        self.assertEqual(replica_aliases(databases), ['replica1'])
+
+    def test_no_replicas(self):
+        """Test only the primary is configured without DB_REPLICAS."""
+        databases = database_settings({'DB_REPLICAS': ' '}, BASE_DIR)
+
+        self.assertEqual(replica_aliases(databases), [])
+
+    def test_unknown_pool_error(self):
+        """Test an unsupported pool raises an error."""
+        with self.assertRaises(ValueError):
+            database_settings({'DB_HOST': 'db', 'DB_POOL': 'pgpool'}, BASE_DIR)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Needs PostgreSQL.')
+class PostgresConnectionTests(TestCase):
+    """Test the live PostgreSQL connection, when tests run against one."""
+
+    def test_connection_persists(self):
+        """Test the connection is reused and checked before reuse."""
+        self.assertGreater(connection.settings_dict['CONN_MAX_AGE'], 0)
+        self.assertTrue(connection.settings_dict['CONN_HEALTH_CHECKS'])
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_backend_pid()')
+            pid = cursor.fetchone()[0]
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_backend_pid()')
+            self.assertEqual(cursor.fetchone()[0], pid)
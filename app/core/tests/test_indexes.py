@@ -0,0 +1,135 @@
+"""
+Tests for the indexes and constraints on the hot access paths.
+"""
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models.functions import Lower
+from django.test import TestCase, TransactionTestCase
+
+from core import models
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Plans are checked on sqlite.')
+class IndexUsageTests(TestCase):
+    """Test the planner picks the indexes for the hot queries."""
+
+    def test_comments_of_blog_use_index(self):
+        """Test listing a blog's newest comments uses the index."""
+        plan = models.Comment.objects.filter(
+            blog_id=1,
+        ).order_by('-id').explain()
+
+        self.assertIn('comment_blog_id_idx', plan)
+
+    def test_blogs_of_author_use_index(self):
+        """Test listing an author's newest blogs uses the index."""
+        plan = models.Blog.objects.filter(
+            author_id=1,
+        ).order_by('-created_at').explain()
+
+        self.assertIn('blog_author_created_idx', plan)
+
+    def test_newest_blogs_use_index(self):
+        """Test listing the newest blogs uses the index."""
+        plan = models.Blog.objects.order_by('-created_at').explain()
+
+        self.assertIn('blog_created_idx', plan)
+
+    def test_tag_name_lookup_uses_index(self):
+        """Test looking up tags by lowercased name uses the index."""
+        plan = models.Tag.objects.annotate(
+            name_lower=Lower('name'),
+        ).filter(name_lower__in=['django', 'python']).explain()
+
+        self.assertIn('unique_tag_name_ci', plan)
+
+
+class TagConstraintTests(TestCase):
+    """Test the tag name constraint."""
+
+    def test_tag_name_unique_ignoring_case(self):
+        """Test creating a tag differing only by case raises an error."""
+        models.Tag.objects.create(name='Django')
+
+        with self.assertRaises(IntegrityError):
+            models.Tag.objects.create(name='django')
+
+    def test_merge_duplicate_tags_command(self):
+        """Test the command reports nothing to merge on a clean table."""
+        models.Tag.objects.create(name='Django')
+
+        out = StringIO()
+        call_command('merge_duplicate_tags', stdout=out)
+
+        self.assertIn('Merged 0 duplicate tag(s).', out.getvalue())
+        self.assertEqual(models.Tag.objects.count(), 1)
+
+
+class MergeDuplicateTagsMigrationTests(TransactionTestCase):
+    """Test duplicate tags are merged before the constraint is added."""
+    migrate_from = (
+        'core',
+        '0006_comment_created_at_comment_updated_at_and_more',
+    )
+    migrate_to = ('core', '0008_blog_comment_indexes_tag_unique_name')
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate([self.migrate_from])
+        self.old_apps = executor.loader.project_state(
+            [self.migrate_from],
+        ).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_merged(self):
+        """Test blogs of duplicate tags are relinked to the oldest tag."""
+        User = self.old_apps.get_model('core', 'User')
+        Tag = self.old_apps.get_model('core', 'Tag')
+        Blog = self.old_apps.get_model('core', 'Blog')
+        user = User.objects.create(email='user@example.com')
+        kept = Tag.objects.create(name='Django')
+        upper = Tag.objects.create(name='DJANGO')
+        lower = Tag.objects.create(name='django')
+        other = Tag.objects.create(name='Python')
+        blog1 = Blog.objects.create(
+            author=user, title='1', excerpt='e', content='c',
+        )
+        blog1.tags.add(kept, upper)
+        blog2 = Blog.objects.create(
+            author=user, title='2', excerpt='e', content='c',
+        )
+        blog2.tags.add(upper, lower, other)
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate([self.migrate_to])
+        apps = executor.loader.project_state([self.migrate_to]).apps
+        Tag = apps.get_model('core', 'Tag')
+        Blog = apps.get_model('core', 'Blog')
+
+        self.assertEqual(
+            sorted(Tag.objects.values_list('name', flat=True)),
+            ['Django', 'Python'],
+        )
+        self.assertEqual(
+            list(Blog.objects.get(id=blog1.id).tags.values_list(
+                'id',
+                flat=True,
+            )),
+            [kept.id],
+        )
+        self.assertEqual(
+            sorted(Blog.objects.get(id=blog2.id).tags.values_list(
+                'id',
+                flat=True,
+            )),
+            sorted([kept.id, other.id]),
+        )
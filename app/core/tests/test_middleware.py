@@ -0,0 +1,92 @@
+"""
+Tests for the middleware skipped on API paths.
+"""
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from core import middleware
+
+
+def record_request(request):
+    """Return a response listing what the middleware set on the request."""
+    attributes = [
+        name for name in ('session', 'user', '_messages')
+        if hasattr(request, name)
+    ]
+    return HttpResponse(','.join(attributes))
+
+
+def protected_view(request):
+    """A view subject to CSRF checks."""
+    return HttpResponse()
+
+
+def stack():
+    """Return the session, auth and message middleware around a view."""
+    return middleware.SessionMiddleware(
+        middleware.AuthenticationMiddleware(
+            middleware.MessageMiddleware(record_request),
+        ),
+    )
+
+
+class SkipOnApiPathsTests(TestCase):
+    """Test the middleware only runs outside the APIs."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_api_paths_skipped(self):
+        """Test API requests get no session, user or messages."""
+        for path in ('/api/blog/blogs/', '/api/user/me/'):
+            res = stack()(self.factory.get(path))
+
+            self.assertEqual(res.content, b'')
+
+    def test_other_paths_kept(self):
+        """Test admin requests get the session, user and messages."""
+        res = stack()(self.factory.get('/admin/'))
+
+        self.assertEqual(res.content, b'session,user,_messages')
+
+    @override_settings(API_PATH_PREFIXES=[])
+    def test_no_api_paths(self):
+        """Test every path gets the stock behaviour without API prefixes."""
+        res = stack()(self.factory.get('/api/blog/blogs/'))
+
+        self.assertEqual(res.content, b'session,user,_messages')
+
+    def test_csrf_skipped_on_api_paths(self):
+        """Test CSRF checks only apply outside the APIs."""
+        csrf = middleware.CsrfViewMiddleware(protected_view)
+
+        api = csrf.process_view(
+            self.factory.post('/api/blog/blogs/'),
+            protected_view,
+            (),
+            {},
+        )
+        admin = csrf.process_view(
+            self.factory.post('/admin/login/'),
+            protected_view,
+            (),
+            {},
+        )
+
+        self.assertIsNone(api)
+        self.assertEqual(admin.status_code, 403)
+
+    def test_api_responses_set_no_cookies(self):
+        """Test API responses carry no session or CSRF cookies."""
+        res = self.client.get(reverse('blog:blog-list'))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.cookies, {})
+
+    def test_admin_login_keeps_csrf(self):
+        """Test the admin login page still sets a CSRF cookie."""
+        res = self.client.get(reverse('admin:login'))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('csrftoken', res.cookies)
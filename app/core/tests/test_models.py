@@ -2,7 +2,11 @@
 Tests for models.
 """
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models.signals import post_save
+from django.utils.connection import ConnectionDoesNotExist
 
 from core import models
 
@@ -85,3 +89,133 @@ class ModelTest(TestCase):
         )
 
         self.assertEqual(str(comment), comment.comment_text)
+
+    def test_comments_count_follows_comments(self):
+        """Test the blog comments count tracks comment creates and deletes."""
+        user = get_user_model().objects.create_user(
+            'test@example.com',
+            'testpass123',
+        )
+        blog = models.Blog.objects.create(
+            author=user,
+            title="Sample Blog Title",
+            excerpt="This is a test blog excerpt.",
+            content="Some test content regarding the test blog.",
+        )
+
+        comments = [
+            models.Comment.objects.create(
+                author=user,
+                comment_text="This is test comment",
+                blog=blog,
+            )
+            for _ in range(3)
+        ]
+        comments[0].delete()
+
+        blog.refresh_from_db()
+        self.assertEqual(blog.comments_count, 2)
+
+    def test_deleting_blog_skips_comment_counts(self):
+        """Test comments deleted with their blog do not update it."""
+        user = get_user_model().objects.create_user(
+            'test@example.com',
+            'testpass123',
+        )
+        other = get_user_model().objects.create_user(
+            'other@example.com',
+            'testpass123',
+        )
+        blog, other_blog = [
+            models.Blog.objects.create(
+                author=user,
+                title="Sample Blog Title",
+                excerpt="This is a test blog excerpt.",
+                content="Some test content regarding the test blog.",
+            )
+            for _ in range(2)
+        ]
+        for commented in (blog, blog, other_blog):
+            models.Comment.objects.create(
+                author=other,
+                comment_text="This is test comment",
+                blog=commented,
+            )
+
+        with CaptureQueriesContext(connection) as context:
+            blog.delete()
+
+        self.assertFalse([
+            query for query in context.captured_queries
+            if 'comments_count' in query['sql']
+        ])
+        other.delete()
+        other_blog.refresh_from_db()
+        self.assertEqual(other_blog.comments_count, 0)
+
+    def test_counters_written_to_database_of_change(self):
+        """Test counter handlers write to the alias they are sent."""
+        user = get_user_model().objects.create_user(
+            'test@example.com',
+            'testpass123',
+        )
+        blog = models.Blog.objects.create(
+            author=user,
+            title="Sample Blog Title",
+            excerpt="This is a test blog excerpt.",
+            content="Some test content regarding the test blog.",
+        )
+        comment = models.Comment.objects.create(
+            author=user,
+            comment_text="This is test comment",
+            blog=blog,
+        )
+
+        with self.assertRaises(ConnectionDoesNotExist):
+            post_save.send(
+                models.Comment,
+                instance=comment,
+                created=True,
+                using='missing',
+            )
+
+    def test_blogs_count_follows_tagging(self):
+        """Test the tag blogs count tracks tagging from either side."""
+        user = get_user_model().objects.create_user(
+            'test@example.com',
+            'testpass123',
+        )
+        blogs = [
+            models.Blog.objects.create(
+                author=user,
+                title="Sample Blog Title",
+                excerpt="This is a test blog excerpt.",
+                content="Some test content regarding the test blog.",
+            )
+            for _ in range(3)
+        ]
+        tag = models.Tag.objects.create(name='Django')
+        other = models.Tag.objects.create(name='Python')
+
+        blogs[0].tags.add(tag, other)
+        blogs[0].tags.add(tag)
+        tag.blog_set.add(blogs[1], blogs[2])
+        tag.refresh_from_db()
+        self.assertEqual(tag.blogs_count, 3)
+
+        blogs[1].tags.remove(tag, other)
+        tag.blog_set.remove(blogs[1])
+        tag.refresh_from_db()
+        self.assertEqual(tag.blogs_count, 2)
+
+        blogs[0].tags.clear()
+        blogs[2].delete()
+        tag.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(tag.blogs_count, 0)
+        self.assertEqual(other.blogs_count, 0)
+
+        tag.blog_set.set(blogs[:2])
+        tag.blog_set.clear()
+        tag.refresh_from_db()
+        self.assertEqual(tag.blogs_count, 0)
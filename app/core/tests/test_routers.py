@@ -0,0 +1,180 @@
+"""
+Tests for routing reads to database replicas.
+
+The tests against real replicas run when the suite is started with
+DB_REPLICAS set, e.g. with two sqlite files standing in for the primary
+and its replica:
+
+    DB_NAME=primary.sqlite3 DB_REPLICAS=replica.sqlite3 \\
+        python manage.py test core.tests.test_routers
+"""
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from blog.views import BlogViewSet
+from core.models import Blog
+from core.routers import (
+    PIN_COOKIE,
+    ReplicaPinningMiddleware,
+    current_routing,
+)
+from user.views import ManageUserView
+
+
+BLOG_URL = reverse('blog:blog-list')
+blog_list = BlogViewSet.as_view({'get': 'list', 'post': 'create'})
+
+
+def route(request, view_func, write=False):
+    """Pass a request through the middleware, return where reads went."""
+    databases = []
+
+    def get_response(request):
+        middleware.process_view(request, view_func, (), {})
+        databases.append(router.db_for_read(Blog))
+        if write:
+            router.db_for_write(Blog)
+            databases.append(router.db_for_read(Blog))
+        return HttpResponse()
+
+    middleware = ReplicaPinningMiddleware(get_response)
+    response = middleware(request)
+
+    return databases, response
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTests(SimpleTestCase):
+    """Test choosing the database of each query."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_outside_requests_use_primary(self):
+        """Test queries outside a request go to the primary."""
+        self.assertIsNone(current_routing.get())
+        self.assertEqual(router.db_for_read(Blog), 'default')
+        self.assertEqual(router.db_for_write(Blog), 'default')
+
+    def test_safe_request_reads_replica(self):
+        """Test GET requests to replica-reading views read a replica."""
+        databases, response = route(self.factory.get(BLOG_URL), blog_list)
+
+        self.assertEqual(databases, ['replica1'])
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_unsafe_request_uses_primary(self):
+        """Test POST requests read from the primary."""
+        databases, _ = route(self.factory.post(BLOG_URL), blog_list)
+
+        self.assertEqual(databases, ['default'])
+
+    def test_other_views_use_primary(self):
+        """Test views not marked read_from_replica read from the primary."""
+        view = ManageUserView.as_view()
+
+        databases, _ = route(self.factory.get('/api/user/me/'), view)
+
+        self.assertEqual(databases, ['default'])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        """Test reads go to the primary when there is no replica."""
+        databases, _ = route(self.factory.get(BLOG_URL), blog_list)
+
+        self.assertEqual(databases, ['default'])
+
+    def test_write_pins_request_and_client(self):
+        """Test a write sends later reads and requests to the primary."""
+        request = self.factory.get(BLOG_URL)
+
+        databases, response = route(request, blog_list, write=True)
+
+        self.assertEqual(databases, ['replica1', 'default'])
+        cookie = response.cookies[PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_LAG_SECONDS)
+        self.assertTrue(cookie['httponly'])
+
+    def test_pinned_client_uses_primary(self):
+        """Test clients that recently wrote read from the primary."""
+        request = self.factory.get(BLOG_URL)
+        request.COOKIES[PIN_COOKIE] = '1'
+
+        databases, _ = route(request, blog_list)
+
+        self.assertEqual(databases, ['default'])
+
+    def test_relations_across_replicas(self):
+        """Test objects of the primary and a replica can be related."""
+        primary, replica = Blog(), Blog()
+        primary._state.db, replica._state.db = 'default', 'replica1'
+
+        self.assertTrue(router.allow_relation(primary, replica))
+
+
+@skipUnless(settings.DATABASE_REPLICAS, 'Needs DB_REPLICAS.')
+class ReplicaReadTests(TestCase):
+    """Test reading from a real replica database."""
+    databases = {'default', *settings.DATABASE_REPLICAS}
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.replica = settings.DATABASE_REPLICAS[0]
+        self.user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='test123',
+        )
+        # The replica holds its own rows, so reads show where they went.
+        for database, title in (
+                ('default', 'Primary blog'),
+                (self.replica, 'Replica blog'),
+        ):
+            author = get_user_model().objects.db_manager(
+                database,
+            ).create_user(email=f'{database}@example.com', password='test123')
+            Blog.objects.using(database).create(
+                author=author,
+                title=title,
+                excerpt='Sample blog excerpt.',
+                content='Sample blog content.',
+            )
+
+    def titles(self, res):
+        """Return the blog titles of a list response."""
+        return [blog['title'] for blog in res.data['results']]
+
+    def test_list_reads_replica(self):
+        """Test anonymous blog lists are read from the replica."""
+        res = self.client.get(BLOG_URL)
+
+        self.assertEqual(self.titles(res), ['Replica blog'])
+
+    def test_read_your_writes(self):
+        """Test a client reads from the primary after writing."""
+        self.client.force_authenticate(self.user)
+        res = self.client.post(BLOG_URL, {
+            'title': 'New blog',
+            'excerpt': 'New excerpt.',
+            'content': 'New content.',
+        }, format='json')
+        self.assertIn(PIN_COOKIE, res.cookies)
+
+        res = self.client.get(BLOG_URL)
+
+        self.assertEqual(
+            self.titles(res),
+            ['New blog', 'Primary blog'],
+        )
+        self.assertFalse(
+            Blog.objects.using(self.replica).filter(title='New blog').exists()
+        )
@@ -0,0 +1,138 @@
+"""
+Tests for the stored OpenAPI schema.
+"""
+from contextlib import contextmanager
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from core import schema
+
+
+SCHEMA_URL = reverse('api-schema')
+
+
+@contextmanager
+def temporary_schema_path():
+    """Point the stored schema at a missing temporary file."""
+    with TemporaryDirectory() as directory:
+        path = Path(directory) / 'openapi.yml'
+        with override_settings(OPENAPI_SCHEMA_PATH=path):
+            yield path
+
+
+class SchemaTests(SimpleTestCase):
+    """Test building and serving the schema."""
+
+    def setUp(self):
+        schema.load_schema.cache_clear()
+        self.addCleanup(schema.load_schema.cache_clear)
+
+    def test_stored_schema_is_current(self):
+        """Test the stored schema matches the code."""
+        out = StringIO()
+
+        call_command('build_schema', check=True, stdout=out)
+
+        self.assertIn('is current', out.getvalue())
+
+    @patch(
+        'core.management.commands.build_schema.generate_schema',
+        return_value=b'# sha256: x\n',
+    )
+    def test_check_stale_schema(self, patched_generate):
+        """Test the check fails when the code changed the schema."""
+        with self.assertRaises(CommandError):
+            call_command('build_schema', check=True, stdout=StringIO())
+
+    def test_build_schema(self):
+        """Test the schema is written headed by the hash of its body."""
+        path = self.enterContext(temporary_schema_path())
+
+        call_command('build_schema', stdout=StringIO())
+
+        content = path.read_bytes()
+        digest = schema.schema_hash(content)
+        self.assertEqual(len(digest), 64)
+        self.assertTrue(content.split(b'\n', 1)[1].startswith(b'openapi:'))
+
+    def test_serve_schema(self):
+        """Test the schema is served with a strong ETag."""
+        content, digest = schema.load_schema()
+
+        res = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.content, content)
+        self.assertEqual(res['ETag'], f'"{digest}"')
+        self.assertIn('no-cache', res['Cache-Control'])
+        self.assertTrue(res['Content-Type'].startswith(
+            'application/vnd.oai.openapi',
+        ))
+
+    def test_serve_schema_as_json(self):
+        """Test the schema is also served as JSON."""
+        content, digest = schema.load_schema()
+
+        res = self.client.get(SCHEMA_URL, {'format': 'json'})
+
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res['Content-Type'], schema.JSON_CONTENT_TYPE)
+        self.assertEqual(res['ETag'], f'"{digest}-json"')
+        self.assertEqual(res.json()['openapi'], '3.0.3')
+        self.assertIn('/api/blog/blogs/', res.json()['paths'])
+
+    def test_schema_not_modified(self):
+        """Test clients holding the current schema get 304 Not Modified."""
+        digest = schema.load_schema()[1]
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=f'"{digest}"')
+
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b'')
+
+    def test_hashed_schema_is_immutable(self):
+        """Test the hashed schema URL may be cached for a long time."""
+        digest = schema.load_schema()[1]
+
+        res = self.client.get(reverse('api-schema-hashed', args=[digest]))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('immutable', res['Cache-Control'])
+        self.assertIn(
+            f'max-age={schema.IMMUTABLE_MAX_AGE}',
+            res['Cache-Control'],
+        )
+
+    def test_old_hashed_schema_not_found(self):
+        """Test URLs of other schema versions are not found."""
+        res = self.client.get(reverse('api-schema-hashed', args=['0' * 64]))
+
+        self.assertEqual(res.status_code, 404)
+
+    def test_docs_load_hashed_schema(self):
+        """Test Swagger UI loads the schema from its hashed URL."""
+        digest = schema.load_schema()[1]
+
+        res = self.client.get(reverse('api-docs'))
+
+        self.assertContains(
+            res,
+            reverse('api-schema-hashed', args=[digest]),
+        )
+
+    def test_generate_missing_schema(self):
+        """Test the schema is generated when none is stored."""
+        self.enterContext(temporary_schema_path())
+
+        with self.assertLogs('core.schema', 'WARNING'):
+            content, digest = schema.load_schema()
+
+        self.assertEqual(content, schema.generate_schema())
+        self.assertEqual(digest, schema.schema_hash(content))
@@ -0,0 +1,130 @@
+"""
+Tests for synthetic data seeding.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import TestCase
+
+from blog.search import search
+from core import seeding
+from core.models import Blog, Comment, Tag, User
+
+
+def snapshot():
+    """Return the seeded rows, independent of their ids."""
+    return {
+        'users': list(User.objects.order_by('id').values_list(
+            'email', 'name',
+        )),
+        'blogs': list(Blog.objects.order_by('id').values_list(
+            'author__email', 'title', 'excerpt', 'content', 'comments_count',
+        )),
+        'tags': list(Blog.tags.through.objects.order_by('id').values_list(
+            'blog__title', 'tag__name',
+        )),
+        'comments': list(Comment.objects.order_by('id').values_list(
+            'blog__title', 'author__email', 'comment_text',
+        )),
+    }
+
+
+class SeedingTests(TestCase):
+    """Test seeding synthetic data."""
+
+    def test_seed_data(self):
+        """Test seeding creates the rows with consistent counters."""
+        created = seeding.seed_data(users=5, blogs=20, comments=50, tags=8)
+
+        self.assertEqual(created, {User: 5, Tag: 8, Blog: 20, Comment: 50})
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Tag.objects.count(), 8)
+        self.assertEqual(Blog.objects.count(), 20)
+        self.assertEqual(Comment.objects.count(), 50)
+        for blog in Blog.objects.annotate(total=Count('comments')):
+            self.assertEqual(blog.comments_count, blog.total)
+        for tag in Tag.objects.annotate(total=Count('blog')):
+            self.assertEqual(tag.blogs_count, tag.total)
+        self.assertTrue(all(
+            len(comment.comment_text) <= 255
+            for comment in Comment.objects.all()
+        ))
+
+    def test_users_share_password(self):
+        """Test every seeded user can log in with the seed password."""
+        seeding.seed_data(users=3, blogs=0, comments=0)
+
+        passwords = set(User.objects.values_list('password', flat=True))
+        self.assertEqual(len(passwords), 1)
+        self.assertTrue(User.objects.first().check_password(seeding.PASSWORD))
+
+    def test_deterministic_by_seed(self):
+        """Test the same seed produces the same data at any batch size."""
+        seeding.seed_data(users=4, blogs=10, comments=30, seed=7)
+        first = snapshot()
+        User.objects.all().delete()
+        Tag.objects.all().delete()
+
+        seeding.seed_data(users=4, blogs=10, comments=30, seed=7,
+                          batch_size=3)
+
+        self.assertEqual(snapshot(), first)
+
+    def test_other_seed_adds_data(self):
+        """Test seeding with another seed adds to the existing data."""
+        seeding.seed_data(users=2, blogs=3, comments=3, tags=5, seed=1)
+
+        seeding.seed_data(users=2, blogs=3, comments=3, tags=5, seed=2)
+
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(Tag.objects.count(), 5)
+        self.assertEqual(Blog.objects.count(), 6)
+
+    def test_search_index_rebuilt(self):
+        """Test seeded blogs can be searched."""
+        seeding.seed_data(users=1, blogs=5, comments=0)
+        blog = Blog.objects.first()
+
+        results = search(Blog.objects.all(), blog.title)
+
+        self.assertIn(blog, results)
+
+    def test_tag_names(self):
+        """Test tag names are distinct beyond the list of topics."""
+        names = seeding.tag_names(len(seeding.TOPICS) + 3)
+
+        self.assertEqual(len(set(names)), len(names))
+        self.assertEqual(names[:2], seeding.TOPICS[:2])
+
+    def test_comments_need_blogs(self):
+        """Test comments cannot be seeded without blogs."""
+        with self.assertRaises(ValueError):
+            seeding.seed_data(users=1, blogs=0, comments=1)
+
+    def test_seed_data_command(self):
+        """Test the command seeds the requested counts."""
+        out = StringIO()
+
+        call_command(
+            'seed_data',
+            users=2,
+            blogs=4,
+            comments=6,
+            tags=3,
+            stdout=out,
+        )
+
+        self.assertEqual(Comment.objects.count(), 6)
+        self.assertIn(
+            'Seeded 2 users, 3 tags, 4 blogs, 6 comments',
+            out.getvalue(),
+        )
+
+    def test_seed_data_command_invalid(self):
+        """Test the command rejects impossible counts."""
+        with self.assertRaises(CommandError):
+            call_command('seed_data', users=0, blogs=1, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('seed_data', blogs=-1, stdout=StringIO())
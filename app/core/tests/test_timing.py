@@ -0,0 +1,94 @@
+"""
+Tests for the request timing middleware.
+"""
+import json
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Blog
+
+
+BLOG_URL = reverse('blog:blog-list')
+
+
+def server_timing(response):
+    """Return the Server-Timing metrics of a response by name."""
+    metrics = {}
+    for metric in response['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        metrics[name] = dict(param.split('=', 1) for param in params)
+
+    return metrics
+
+
+@override_settings(
+    REQUEST_TIMING_ENABLED=True,
+    REQUEST_TIMING_LOG_SAMPLE_RATE=0,
+    SLOW_QUERY_THRESHOLD_MS=10_000,
+)
+class TimingMiddlewareTests(TestCase):
+    """Test timing requests."""
+
+    def setUp(self):
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(
+            email='user@example.com',
+            password='test123',
+        )
+        Blog.objects.create(
+            author=user,
+            title='Sample blog title',
+            excerpt='Sample blog excerpt.',
+            content='Sample blog content.',
+        )
+
+    def test_server_timing_header(self):
+        """Test responses report queries, serializer and total time."""
+        with self.assertNumQueries(4) as context:
+            res = self.client.get(BLOG_URL, {'include': 'comments'})
+
+        metrics = server_timing(res)
+        self.assertEqual(
+            metrics['db']['desc'],
+            f'"{len(context.captured_queries)} queries"',
+        )
+        self.assertGreater(float(metrics['serializer']['dur']), 0)
+        self.assertGreaterEqual(
+            float(metrics['total']['dur']),
+            float(metrics['db']['dur']) + float(metrics['serializer']['dur']),
+        )
+
+    @override_settings(REQUEST_TIMING_LOG_SAMPLE_RATE=1)
+    def test_sampled_request_log(self):
+        """Test sampled requests are logged as JSON."""
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            self.client.get(BLOG_URL)
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line['route'], 'blog:blog-list')
+        self.assertEqual(line['status'], 200)
+        self.assertEqual(line['queries'], 3)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_slow_query_log(self):
+        """Test queries over the threshold are logged with their route."""
+        with self.assertLogs('core.timing.slow_query', 'WARNING') as logs:
+            self.client.get(BLOG_URL)
+
+        lines = [json.loads(record.getMessage()) for record in logs.records]
+        self.assertEqual({line['route'] for line in lines}, {'blog:blog-list'})
+        self.assertTrue(any(
+            re.search(r'FROM "core_blog"', line['sql']) for line in lines
+        ))
+
+    @override_settings(REQUEST_TIMING_ENABLED=False)
+    def test_disabled(self):
+        """Test nothing is reported when timing is disabled."""
+        res = self.client.get(BLOG_URL)
+
+        self.assertNotIn('Server-Timing', res)
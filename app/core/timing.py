@@ -0,0 +1,172 @@
+"""
+Per-request timing of SQL, serialization and views.
+
+TimingMiddleware measures each request and reports it in a Server-Timing
+header, a sampled structured log line and a log of slow queries. When
+REQUEST_TIMING_ENABLED is off the middleware removes itself at startup
+and no query wrapper is installed, so the only cost left is one context
+variable lookup per serialized object.
+"""
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f'{__name__}.slow_query')
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RequestTimings:
+    """Timings collected while serving one request."""
+
+    def __init__(self, request):
+        self.request = request
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.durations = {'db': 0.0, 'serializer': 0.0}
+        self.depth = {}
+
+    @property
+    def route(self):
+        """Return the name of the matched URL pattern."""
+        match = getattr(self.request, 'resolver_match', None)
+        return match.view_name if match is not None else None
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's timings.
+
+    Nested blocks of the same name are only counted once.
+    """
+    timings = current_timings.get()
+    if timings is None or timings.depth.get(name):
+        yield
+        return
+
+    timings.depth[name] = 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[name] += time.perf_counter() - start
+        timings.depth[name] = 0
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper counting and timing queries of the current request."""
+    timings = current_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        timings.queries += 1
+        timings.durations['db'] += duration
+        if duration * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            slow_query_logger.warning(json.dumps({
+                'route': timings.route,
+                'duration_ms': round(duration * 1000, 3),
+                'sql': sql,
+            }))
+
+
+def install_query_wrapper(connection, **kwargs):
+    """Time the queries run on a database connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimingMiddleware:
+    """Report query, serializer and view timings of each request."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_wrapper)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        timings = self.start(request)
+        token = current_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        return self.finish(timings, response)
+
+    async def __acall__(self, request):
+        timings = self.start(request)
+        token = current_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+
+        return self.finish(timings, response)
+
+    def start(self, request):
+        """Start timing a request."""
+        for connection in connections.all(initialized_only=True):
+            install_query_wrapper(connection)
+
+        return RequestTimings(request)
+
+    def finish(self, timings, response):
+        """Report the timings of a request on its response and in the log."""
+        total = time.perf_counter() - timings.start
+        durations = {
+            name: round(duration * 1000, 3)
+            for name, duration in (
+                *timings.durations.items(),
+                ('total', total),
+            )
+        }
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={durations["db"]};desc="{timings.queries} queries"',
+            f'serializer;dur={durations["serializer"]}',
+            f'total;dur={durations["total"]}',
+        ])
+        if random.random() < settings.REQUEST_TIMING_LOG_SAMPLE_RATE:
+            logger.info(json.dumps({
+                'method': timings.request.method,
+                'path': timings.request.path,
+                'route': timings.route,
+                'status': response.status_code,
+                'queries': timings.queries,
+                **{f'{name}_ms': value for name, value in durations.items()},
+            }))
+
+        return response
+
+
+class TimedSerializerMixin:
+    """Count the time spent serializing towards the request's timings."""
+
+    def to_representation(self, instance):
+        if current_timings.get() is None:
+            return super().to_representation(instance)
+        with timed('serializer'):
+            return super().to_representation(instance)
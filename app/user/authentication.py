@@ -0,0 +1,112 @@
+"""
+Token authentication backed by an in-process and a shared cache.
+"""
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+class LocalTTLCache:
+    """Thread-safe, size-bounded in-process cache with expiring entries."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the live value stored under key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        """Store value under key for timeout seconds."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Drop the value stored under key."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every value."""
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalTTLCache(settings.AUTH_TOKEN_LOCAL_CACHE_SIZE)
+
+
+def token_cache_key(key):
+    """Return the cache key of a token, without exposing the token."""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'user:token:{digest}'
+
+
+def invalidate_token(key):
+    """Forget the cached user of a token."""
+    cache_key = token_cache_key(key)
+    local_cache.delete(cache_key)
+    cache.delete(cache_key)
+
+
+def invalidate_user_tokens(user):
+    """Forget the cached user of every token of a user.
+
+    Other processes keep their in-process entry for at most
+    AUTH_TOKEN_LOCAL_CACHE_TIMEOUT seconds.
+    """
+    keys = Token.objects.filter(user=user).values_list('key', flat=True)
+    for key in keys:
+        invalidate_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication without a query for recently seen tokens.
+
+    Tokens resolve from an in-process cache first, then from the shared
+    Django cache, and only then from the database.
+    """
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        # Pickled, so that requests never share a mutable user instance.
+        pickled = local_cache.get(cache_key)
+        if pickled is not None:
+            token = pickle.loads(pickled)
+        else:
+            token = cache.get(cache_key)
+            if token is None:
+                _, token = super().authenticate_credentials(key)
+                cache.set(
+                    cache_key,
+                    token,
+                    settings.AUTH_TOKEN_CACHE_TIMEOUT,
+                )
+            local_cache.set(
+                cache_key,
+                pickle.dumps(token, pickle.HIGHEST_PROTOCOL),
+                settings.AUTH_TOKEN_LOCAL_CACHE_TIMEOUT,
+            )
+
+        return (token.user, token)
@@ -0,0 +1,124 @@
+"""
+Tests for the cached token authentication.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from user.authentication import local_cache
+
+
+ME_URL = reverse('user:me')
+
+
+def create_user(**params):
+    """Create and return a new user."""
+    return get_user_model().objects.create_user(**params)
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test authenticating with cached tokens."""
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.user = create_user(
+            email='test@example.com',
+            password='testpass123',
+            name='Test Name',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeated_request_runs_no_auth_query(self):
+        """Test a known token is resolved without a query."""
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+    def test_shared_cache_fallback(self):
+        """Test a token missing locally is resolved from the shared cache."""
+        self.client.get(ME_URL)
+        local_cache.clear()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_invalid_token_rejected(self):
+        """Test an unknown token is rejected."""
+        self.client.credentials(HTTP_AUTHORIZATION='Token invalid')
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_rejected(self):
+        """Test a deleted token stops authenticating."""
+        self.client.get(ME_URL)
+
+        self.token.delete()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_rejected(self):
+        """Test a deactivated user's token stops authenticating."""
+        self.client.get(ME_URL)
+
+        self.user.is_active = False
+        self.user.save()
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_profile_update_keeps_newer_columns(self):
+        """Test updating the profile does not write back a cached user."""
+        self.client.get(ME_URL)
+        get_user_model().objects.filter(id=self.user.id).update(
+            is_staff=False,
+        )
+
+        res = self.client.patch(ME_URL, {'name': 'Updated Name'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Updated Name')
+        self.assertFalse(self.user.is_staff)
+
+    def test_profile_update_keeps_followers_count(self):
+        """Test a follow is not undone by the author's profile update."""
+        self.client.get(ME_URL)
+        follower = create_user(email='follower@example.com', password='pw1')
+        client = APIClient()
+        client.force_authenticate(follower)
+        client.post(reverse('user:follow', args=[self.user.id]))
+        # The follow dropped the cached author.
+        with self.assertNumQueries(1):
+            self.client.get(ME_URL)
+
+        self.client.patch(ME_URL, {'name': 'Updated Name'})
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.followers_count, 1)
+
+    def test_profile_update_refreshes_user(self):
+        """Test updating the profile drops the cached user."""
+        self.client.get(ME_URL)
+
+        self.client.patch(ME_URL, {'name': 'Updated Name'})
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.data['name'], 'Updated Name')
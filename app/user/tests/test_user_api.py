@@ -14,6 +14,11 @@ TOKEN_URL = reverse('user:token')
 ME_URL = reverse('user:me')
 
 
+def follow_url(user_id):
+    """Create and return the URL following a user."""
+    return reverse('user:follow', args=[user_id])
+
+
 def create_user(**params):
     """
     Create and return a new user.
@@ -151,3 +156,30 @@ class PrivateUserAPITests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(self.user.name, payload['name'])
         self.assertTrue(self.user.check_password(payload['password']))
+
+    def test_follow_user(self):
+        """Test following and unfollowing another user."""
+        author = create_user(email='author@example.com', password='pass123')
+
+        res = self.client.post(follow_url(author.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'following': True, 'followers_count': 1})
+        res = self.client.post(follow_url(author.id))
+        self.assertEqual(res.data, {'following': True, 'followers_count': 1})
+
+        res = self.client.delete(follow_url(author.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {'following': False, 'followers_count': 0})
+        self.assertFalse(self.user.following.exists())
+
+    def test_follow_self_rejected(self):
+        """Test users cannot follow themselves."""
+        res = self.client.post(follow_url(self.user.id))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_follow_unknown_user(self):
+        """Test following a user that does not exist."""
+        res = self.client.post(follow_url(self.user.id + 100))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
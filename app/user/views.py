@@ -1,13 +1,27 @@
 """
 Views for the user API.
 """
-from rest_framework import generics, authentication, permissions
+from django.contrib.auth import get_user_model
+from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext as _
+from drf_spectacular.utils import extend_schema
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 
+from blog.feed import unfollowed
+from core.models import Follow
+from user.authentication import (
+    CachedTokenAuthentication,
+    invalidate_user_tokens,
+)
 from user.serializers import (
     UserSerializer,
     AuthTokenSerializer,
+    FollowSerializer,
 )
 
 
@@ -25,9 +39,64 @@ class CreateTokenView(ObtainAuthToken):
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user."""
     serializer_class = UserSerializer
-    authentication_classes = [authentication.TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        """Retrieve and return the aurthenticated user."""
-        return self.request.user
+        """Retrieve and return the aurthenticated user.
+
+        Reads use the cached user. Writes reload it, so that saving does
+        not write back columns that changed since it was cached.
+        """
+        if self.request.method in permissions.SAFE_METHODS:
+            return self.request.user
+
+        return get_user_model().objects.get(pk=self.request.user.pk)
+
+
+class FollowView(APIView):
+    """Follow or unfollow the posts of another user."""
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_author(self, pk):
+        """Retrieve the user to follow, who cannot be the requester."""
+        author = get_object_or_404(get_user_model(), pk=pk)
+        if author.pk == self.request.user.pk:
+            raise ValidationError(_('Users cannot follow themselves.'))
+
+        return author
+
+    def respond(self, author, following, changed):
+        """Return the follow state and follower count of an author.
+
+        When the count changed, cached copies of the author are dropped,
+        so none carries the old count.
+        """
+        if changed:
+            invalidate_user_tokens(author)
+        author.refresh_from_db(fields=['followers_count'])
+        serializer = FollowSerializer({
+            'following': following,
+            'followers_count': author.followers_count,
+        })
+
+        return Response(serializer.data)
+
+    @extend_schema(request=None, responses=FollowSerializer)
+    def post(self, request, pk):
+        """Follow a user."""
+        author = self.get_author(pk)
+        changed = Follow.objects.follow(request.user, author)
+
+        return self.respond(author, True, changed)
+
+    @extend_schema(request=None, responses=FollowSerializer)
+    def delete(self, request, pk):
+        """Unfollow a user."""
+        author = self.get_author(pk)
+        changed = Follow.objects.unfollow(request.user, author)
+        if changed:
+            unfollowed(author.id)
+
+        return self.respond(author, False, changed)